@@ -15,6 +15,7 @@ class DoublyConnectedEdgeList:
     # TODO: constructors for bounding-box (init with boundingbox, init with linesegments and bounding box) (see ruler of the plane):
     # methods: addsegment, addline
     def __init__(self, points: Iterable[Point] = [], edges: Iterable[Tuple[int, int]] = []):
+        self._revision = 0  # Incremented on every change, so derived data can be cached per revision
         self.clear()
         for point in points:
             self.add_vertex(point)
@@ -26,9 +27,9 @@ class DoublyConnectedEdgeList:
     def add_vertex(self, point: Point) -> Vertex:
         """ Add a new vertex to the DCEL """
         # Check for correct insertion
-        for vertex in self._vertices:
-            if point is vertex.point:
-                return vertex
+        vertex = self._point_index.get(point)
+        if vertex is not None:
+            return vertex
             
         on_edge, edge = self._on_edge(point)
         if on_edge:
@@ -37,8 +38,10 @@ class DoublyConnectedEdgeList:
             # Create vertex
             newVertex: Vertex = Vertex(point)
             self._vertices.append(newVertex)
+            self._point_index[point] = newVertex
             self._edges.append(newVertex.edge)
             newVertex.edge.incident_face = self.find_containing_face(point)
+            self._revision += 1
 
         # First Vertex inserted is the start vertex
         if len(self._vertices) > 0:
@@ -70,23 +73,17 @@ class DoublyConnectedEdgeList:
         If either of the points is not in the DCEL an exception is raised.
         If the edge is already in the DCEL nothing happens.
         """
-        vertex_0, vertex_1 = None, None
-        for vertex in self.vertices:
-            if vertex.point == point:
-                vertex_0 = vertex
-            if vertex.point == other_point:
-                vertex_1 = vertex
-            if vertex_0 is not None and vertex_1 is not None:
-                break
-        for edge in self.edges:
-            if edge.origin.point == point and edge.destination.point == other_point:
-                return
+        vertex_0, vertex_1 = self._point_index.get(point), self._point_index.get(other_point)
         if vertex_0 is None or vertex_1 is None:
             raise ValueError(f"Both points {point} and {other_point} need to be part of the DCEL to insert as an edge")
+        for edge in self.find_edges_of_vertex(vertex_0):
+            if edge.destination is vertex_1:
+                return
         self._add_edge(vertex_0, vertex_1)
 
 
     def _add_edge(self, vertex_0: Vertex, vertex_1: Vertex):
+        self._revision += 1
         half_edge_0 = None
         half_edge_1 = None
         if vertex_0.edge == vertex_0.edge.twin:  # single vertex
@@ -101,13 +98,13 @@ class DoublyConnectedEdgeList:
             self._edges.append(half_edge_1)
 
         # Handle faces
-        num_out_edges_0 = len(vertex_0.outgoing_edges())
-        num_out_edges_1 = len(vertex_1.outgoing_edges())
+        out_edges_0 = vertex_0.outgoing_edges()
+        out_edges_1 = vertex_1.outgoing_edges()
         face_0, face_1 = None, None
         new_face = False
-        if num_out_edges_0 != 0 and num_out_edges_1 != 0:
-            face_0 = self.find_splitting_face(vertex_0, vertex_1.point)
-            face_1 = self.find_splitting_face(vertex_1, vertex_0.point)
+        if out_edges_0 and out_edges_1:
+            face_0 = self.find_splitting_face(vertex_0, vertex_1.point, out_edges_0)
+            face_1 = self.find_splitting_face(vertex_1, vertex_0.point, out_edges_1)
 
             # Check if new edge will create additional face
             # An Inner component with both vertices on the cycle exists
@@ -116,12 +113,12 @@ class DoublyConnectedEdgeList:
             outer_component_split = (not face_0.is_outer) and face_0.outer_component.vertex_on_cycle(vertex_0) and face_0.outer_component.vertex_on_cycle(vertex_1)
             new_face = new_inner_face or outer_component_split
 
-        elif num_out_edges_0 != 0:
-            face_0 = self.find_splitting_face(vertex_0, vertex_1.point)
+        elif out_edges_0:
+            face_0 = self.find_splitting_face(vertex_0, vertex_1.point, out_edges_0)
             face_1 = self.find_containing_face(vertex_1.point)
-        elif num_out_edges_1 != 0:
+        elif out_edges_1:
             face_0 = self.find_containing_face(vertex_0.point)
-            face_1 = self.find_splitting_face(vertex_1, vertex_0.point)
+            face_1 = self.find_splitting_face(vertex_1, vertex_0.point, out_edges_1)
         else:
             face_0 = self.find_containing_face(vertex_0.point)
             face_1 = self.find_containing_face(vertex_1.point)
@@ -173,27 +170,25 @@ class DoublyConnectedEdgeList:
         # fix inner components: inner components has become part of outer components
         # or inner components have merged
         self._fix_inner_components(half_edge_0, half_edge_1, face_0, face_1)
+        face_0.invalidate_geometry()
 
     def clear(self):
         """ Clears the DCEL """
+        self._revision += 1
         self._start_vertex: Optional[Vertex] = None
         self._last_added_vertex: Optional[Vertex] = None
         self._vertices: list[Vertex] = []
+        self._point_index: dict[Point, Vertex] = {}
         self._edges: list[HalfEdge] = []
         self._faces: list[Face] = []
+        self._inner_faces: list[Face] = []
         self._outer_face = Face(None)
         self._outer_face._is_outer = True
         self._faces.append(self._outer_face)
 
     def find_vertex(self, point: Point) -> Vertex:
         """ Gives a vertex for a point if it is in the DCEL, None otherwise. """
-        vertices = list(filter(lambda vertex: vertex.point == point, self._vertices))
-        if len(vertices) > 1:
-            raise AssertionError("More than one vertex at the given position")
-        elif len(vertices) == 1:
-            return vertices[0]
-        else:
-            return None
+        return self._point_index.get(point)
         
     def add_vertex_in_edge(self, edge: HalfEdge, point: Point) -> Vertex:
         """ Adds a vertex on an existing edge by splitting it. """
@@ -206,8 +201,10 @@ class DoublyConnectedEdgeList:
             return # vertex does not need to be added
         
         # Create vertex
+        self._revision += 1
         newVertex = Vertex(point)
         self._vertices.append(newVertex)
+        self._point_index[point] = newVertex
         self._edges.append(newVertex.edge)
         newHalfEdge = HalfEdge(newVertex)
         self._edges.append(newHalfEdge)
@@ -227,22 +224,24 @@ class DoublyConnectedEdgeList:
         # Set faces
         newVertex.edge.incident_face = edge.incident_face
         newHalfEdge.incident_face = newVertex.edge.twin.incident_face
+        newVertex.edge.incident_face.invalidate_geometry()
+        newHalfEdge.incident_face.invalidate_geometry()
 
         return newVertex
         
     def _possible_edge(self, vertex: Vertex, other_vertex: Vertex) -> bool:
         # Vertices are not part to the same face
-        num_out_edges_0 = len(vertex.outgoing_edges())
-        num_out_edges_1 = len(other_vertex.outgoing_edges())
-        if num_out_edges_0 != 0 and num_out_edges_1 != 0:
-            face_0 = self.find_splitting_face(vertex, other_vertex.point)
-            face_1 = self.find_splitting_face(other_vertex, vertex.point)
-        elif num_out_edges_0 != 0:
-            face_0 = self.find_splitting_face(vertex, other_vertex.point)
+        out_edges_0 = vertex.outgoing_edges()
+        out_edges_1 = other_vertex.outgoing_edges()
+        if out_edges_0 and out_edges_1:
+            face_0 = self.find_splitting_face(vertex, other_vertex.point, out_edges_0)
+            face_1 = self.find_splitting_face(other_vertex, vertex.point, out_edges_1)
+        elif out_edges_0:
+            face_0 = self.find_splitting_face(vertex, other_vertex.point, out_edges_0)
             face_1 = self.find_containing_face(other_vertex.point)
-        elif num_out_edges_1 != 0:
+        elif out_edges_1:
             face_0 = self.find_containing_face(vertex.point)
-            face_1 = self.find_splitting_face(other_vertex, vertex.point)
+            face_1 = self.find_splitting_face(other_vertex, vertex.point, out_edges_1)
         else:
             face_0 = self.find_containing_face(vertex.point)
             face_1 = self.find_containing_face(other_vertex.point)            
@@ -269,9 +268,13 @@ class DoublyConnectedEdgeList:
                 return face
         return self.outer_face
 
-    def find_splitting_face(self, vertex: Vertex, point: Point):
-        """ Return the face that is split by a line segment between the given vertex and point and is closest to the vertex. """
-        out_edges = vertex.outgoing_edges()
+    def find_splitting_face(self, vertex: Vertex, point: Point, out_edges: Optional[list[HalfEdge]] = None):
+        """ Return the face that is split by a line segment between the given vertex and point and is closest to the vertex. 
+        
+        The outgoing edges of the vertex can be passed in if they are already known.
+        """
+        if out_edges is None:
+            out_edges = vertex.outgoing_edges()
         if len(out_edges) == 0:
             raise Exception(f"Vertex {vertex} should be connected to face boundary")
         for edge in out_edges:
@@ -280,26 +283,37 @@ class DoublyConnectedEdgeList:
         raise Exception(f"Malformed DCEL: point {point} must split a face around vertex {vertex}")
     
     def find_edges_of_vertex(self, vertex: Vertex) -> list[HalfEdge]:
-        return [edge for edge in self.edges if edge.origin == vertex]
+        """ Returns the half edges starting at the given vertex. A single vertex only has its edge to itself. """
+        return vertex.outgoing_edges() or [vertex.edge]
         
     @staticmethod
-    def _point_between_edge_and_next(point: Point, edge: HalfEdge) -> bool:
+    def _point_between_edge_and_next(point: Point, edge: HalfEdge, epsilon: float = EPSILON) -> bool:
         edge_0, edge_1 = edge, edge.next
-        edge_0_origin, edge_0_destination = edge_0.origin.point, edge_0.destination.point
-        edge_1_origin, edge_1_destination = edge_1.origin.point, edge_1.destination.point
-        
         if edge_0.twin is edge_1:
             return True
-        return point.orientation(edge_0_origin, edge_0_destination) == ORT.LEFT and (
-            point.orientation(edge_1_origin, edge_1_destination) == ORT.LEFT or # Case A
-            edge_1_destination.orientation(edge_0_origin, edge_0_destination) == ORT.RIGHT) or ( # Case B
-            point.orientation(edge_1_origin, edge_1_destination) == ORT.LEFT and edge_0_origin.orientation(edge_1_origin, edge_1_destination) == ORT.RIGHT) # Case C
+
+        # Same predicates as Point.orientation(), evaluated on plain coordinates. The middle vertex is shared by both edges.
+        x, y = point.x, point.y
+        x_0, y_0 = edge_0.origin.x, edge_0.origin.y
+        x_1, y_1 = edge_1.origin.x, edge_1.origin.y
+        x_2, y_2 = edge_1.destination.x, edge_1.destination.y
+        point_left_of_edge_0 = (x - x_0) * (y_1 - y_0) - (y - y_0) * (x_1 - x_0) < -epsilon
+        point_left_of_edge_1 = (x - x_1) * (y_2 - y_1) - (y - y_1) * (x_2 - x_1) < -epsilon
+
+        if point_left_of_edge_0 and point_left_of_edge_1:  # Case A
+            return True
+        elif point_left_of_edge_0:  # Case B: edge_1 turns right
+            return (x_2 - x_0) * (y_1 - y_0) - (y_2 - y_0) * (x_1 - x_0) > epsilon
+        elif point_left_of_edge_1:  # Case C: edge_0 comes from the right
+            return (x_0 - x_1) * (y_2 - y_1) - (y_0 - y_1) * (x_2 - x_1) > epsilon
+        return False
 
     def _split_face(self, edge: HalfEdge, face: Face) -> Face:
         inner_edge = edge if not edge.is_cycle_clockwise() else edge.twin
 
         new_face = Face(inner_edge)
         self._faces.append(new_face)
+        self._inner_faces.append(new_face)
 
         if not inner_edge.twin.is_cycle_clockwise():
             # Two new inner cycles formed from old one
@@ -337,8 +351,19 @@ class DoublyConnectedEdgeList:
                 component.update_face_in_cycle(new_face)
 
 
-    def _on_edge(self, point: Point):
-        found_edges = list(filter(lambda edge: edge.origin.point != edge.destination.point and point.orientation(edge.origin.point, edge.destination.point) == ORT.BETWEEN, self.edges))
+    def _on_edge(self, point: Point, epsilon: float = EPSILON):
+        # Point.orientation() against all edges at once: BETWEEN means no signed area and a projection onto the edge.
+        found_edges = []
+        if self._edges:
+            coordinates = np.array([(edge._origin._point.x, edge._origin._point.y, edge._twin._origin._point.x, edge._twin._origin._point.y)
+                                    for edge in self._edges])
+            self_dx, self_dy = point.x - coordinates[:, 0], point.y - coordinates[:, 1]
+            target_dx, target_dy = coordinates[:, 2] - coordinates[:, 0], coordinates[:, 3] - coordinates[:, 1]
+            squared_length = target_dx * target_dx + target_dy * target_dy
+            is_edge = squared_length != 0.0  # edges of single vertices have no direction
+            a = np.divide(self_dx * target_dx + self_dy * target_dy, squared_length, out=np.zeros_like(squared_length), where=is_edge)
+            between = is_edge & (np.abs(self_dx * target_dy - self_dy * target_dx) <= epsilon) & (a >= 0.0) & (a <= 1.0)
+            found_edges = [self._edges[index] for index in np.flatnonzero(between)]
         num_of_found_edges = len(found_edges)
         if num_of_found_edges < 0 or num_of_found_edges % 2 == 1:
             raise Exception(f"Point {point} lies on a non-possible amount of edges. Something is wrong in the structure of the DCEL.")
@@ -406,6 +431,10 @@ class DoublyConnectedEdgeList:
                     raise Exception(f"Malformed DCEL: Unexpected incident face ({edge.incident_face}) \
                                     of edge {edge} which is inner component of face {face}")
 
+    @property
+    def revision(self) -> int:
+        return self._revision
+
     @property
     def start_vertex(self) -> Optional[Vertex]:
         return self._start_vertex
@@ -427,7 +456,7 @@ class DoublyConnectedEdgeList:
         return self._faces
     
     def inner_faces(self) -> Iterable[Face]:
-        return list(filter(lambda face: not face.is_outer, self.faces))
+        return self._inner_faces
     
     @property
     def number_of_vertices(self) -> int:
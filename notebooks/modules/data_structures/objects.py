@@ -1,24 +1,27 @@
 from __future__ import annotations
 from typing import Iterable, Iterator, Optional, Tuple
 
-from ..geometry import LineSegment, Orientation as ORT, Point, EPSILON
+import numpy as np
+
+from ..geometry import LineSegment, Orientation as ORT, Point, Rectangle, EPSILON
 
 class Vertex:
     """ A vertex for the DCEL """
+    __slots__ = ("_point", "_edge")
+
     def __init__(self, point: Point):
         self._point = point
         self._edge: HalfEdge = HalfEdge(self)
 
     def outgoing_edges(self) -> Iterable[HalfEdge]:
-        outgoing_edges = []
-        outgoing_edge = self.edge
-        if outgoing_edge.destination == self:  # single vertex
+        first_edge = self._edge
+        if first_edge._twin._origin is self:  # single vertex
             return []
-        outgoing_edges.append(outgoing_edge)  # at least one outgoing edge
-        outgoing_edge = outgoing_edge.twin.next
-        while outgoing_edge != self.edge:
+        outgoing_edges = [first_edge]  # at least one outgoing edge
+        outgoing_edge = first_edge._twin._next
+        while outgoing_edge is not first_edge:
             outgoing_edges.append(outgoing_edge)
-            outgoing_edge = outgoing_edge.twin.next
+            outgoing_edge = outgoing_edge._twin._next
         return outgoing_edges
 
     #outgoing and ingoing edges
@@ -50,33 +53,36 @@ class Vertex:
 
 class HalfEdge:
     """ A halfedge defined by an origin and twin, previous and next halfedges. """
+    __slots__ = ("_origin", "_twin", "_prev", "_next", "_incident_face", "_upper_and_lower")
+
     def __init__(self, origin: Vertex):
         self._origin = origin
         self._twin: HalfEdge = self
         self._prev: HalfEdge = self
         self._next: HalfEdge = self
         self._incident_face = None
+        self._upper_and_lower: tuple[Optional[HalfEdge], Optional[tuple[Vertex, Vertex]]] = (None, None)
 
     def cycle(self) -> Iterable[HalfEdge]:
         cycle = [self]
-        next_edge = self.next
-        while next_edge != self:
+        next_edge = self._next
+        while next_edge is not self:
             cycle.append(next_edge)
-            next_edge = next_edge.next
+            next_edge = next_edge._next
         return cycle
     
     def vertex_on_cycle(self, vertex: Vertex) -> bool:
-        return vertex in [edge.origin for edge in self.cycle()]
+        return any(edge._origin is vertex for edge in self.cycle())
     
     def update_face_in_cycle(self, face: Face):
         for edge in self.cycle():
-            edge.incident_face = face
+            edge._incident_face = face
 
     # Determines whether the cycle starting at a given edge is clockwise using the shoelace (trapezoid) formula
     def is_cycle_clockwise(self, epsilon: float = EPSILON) -> bool:
-        a = float(0)
-        for edge in self.cycle():
-            a += (edge.origin.point.y + edge.destination.point.y) * (edge.origin.point.x - edge.destination.point.x)
+        # The destination of each edge is the origin of the next one, so a single walk gathers all coordinates.
+        coordinates = [(edge._origin._point.x, edge._origin._point.y) for edge in self.cycle()]
+        a = sum((y_0 + y_1) * (x_0 - x_1) for (x_0, y_0), (x_1, y_1) in zip(coordinates, coordinates[1:] + coordinates[:1]))
         return a < -epsilon
 
     @property
@@ -89,11 +95,25 @@ class HalfEdge:
 
     @property
     def upper_and_lower(self) -> tuple[Vertex, Vertex]:
-        p, q = self._origin, self.destination
-        if p.y > q.y or (p.y == q.y and p.x < q.x):
-            return p, q
-        else:
-            return q, p
+        # The endpoints can only change with the twin, so the result is cached together with the twin it belongs to.
+        twin, upper_and_lower = self._upper_and_lower
+        if twin is not self._twin:
+            p, q = self._origin, self._twin._origin
+            p_point, q_point = p._point, q._point
+            if p_point.y > q_point.y or (p_point.y == q_point.y and p_point.x < q_point.x):
+                upper_and_lower = p, q
+            else:
+                upper_and_lower = q, p
+            self._upper_and_lower = (self._twin, upper_and_lower)
+        return upper_and_lower
+
+    @property
+    def upper(self) -> Vertex:
+        return self.upper_and_lower[0]
+
+    @property
+    def lower(self) -> Vertex:
+        return self.upper_and_lower[1]
     
     @property
     def left_and_right(self) -> tuple[Vertex, Vertex]:
@@ -153,10 +173,16 @@ class HalfEdge:
 class Face:
     """ Face with inner components """
     # TODO: maybe add additional methods (see ruler of the plane): polygon, polygonwithoutholes, innerpolygons, area, bounding-box
+    __slots__ = ("_outer_component", "_is_outer", "_inner_components", "_outer_half_edges", "_bounding_box", "_outer_ring", "_is_convex")
+
     def __init__(self, outer_component: HalfEdge):
         self._outer_component: HalfEdge = outer_component
         self._is_outer = False
         self._inner_components: list[HalfEdge] = []
+        self._outer_half_edges: Optional[list[HalfEdge]] = None
+        self._bounding_box: Optional[Rectangle] = None
+        self._outer_ring: Optional[list[Tuple[float, float, float, float]]] = None
+        self._is_convex: Optional[bool] = None
     
     @property
     def outer_component(self) -> HalfEdge:
@@ -165,6 +191,22 @@ class Face:
     @outer_component.setter
     def outer_component(self, edge):
         self._outer_component = edge
+        self.invalidate_geometry()
+
+    def invalidate_geometry(self):
+        """ Drops cached geometry of the outer cycle. Has to be called whenever the outer cycle is changed. """
+        self._outer_half_edges = None
+        self._bounding_box = None
+        self._outer_ring = None
+        self._is_convex = None
+
+    @property
+    def bounding_box(self) -> Optional[Rectangle]:
+        if self._bounding_box is None and self._outer_component is not None:
+            ring = self._outer_ring_coordinates()
+            xs, ys = [x for x, _, _, _ in ring], [y for _, y, _, _ in ring]
+            self._bounding_box = Rectangle(Point(min(xs), min(ys)), Point(max(xs), max(ys)))
+        return self._bounding_box
     
     @property
     def is_outer(self) -> bool:
@@ -179,20 +221,19 @@ class Face:
         self._inner_components = list(inner_components)
     
     def outer_points(self) -> Iterable[Point]:
-        return [edge.origin.point for edge in self.outer_half_edges()]
+        return [edge._origin._point for edge in self._outer_cycle()]
     
     def outer_vertices(self) -> Iterable[Vertex]:
-        return [edge.origin for edge in self.outer_half_edges()]
+        return [edge._origin for edge in self._outer_cycle()]
     
     def outer_half_edges(self) -> Iterable[HalfEdge]:
-        if self.outer_component == None:
-            return []
-        outer_edges = [self._outer_component]
-        current_edge = self.outer_component.next
-        while current_edge != self.outer_component:
-            outer_edges.append(current_edge)
-            current_edge = current_edge.next
-        return outer_edges
+        return list(self._outer_cycle())
+
+    def _outer_cycle(self) -> list[HalfEdge]:
+        # The walk along the outer cycle is shared by all outer_* methods and cached until the cycle changes.
+        if self._outer_half_edges is None:
+            self._outer_half_edges = [] if self._outer_component is None else self._outer_component.cycle()
+        return self._outer_half_edges
     
     def inner_half_edges(self) -> Iterable[HalfEdge]:
         inner_half_edges = []
@@ -200,27 +241,52 @@ class Face:
             inner_half_edges.extend(component.cycle())
         return inner_half_edges
 
+    def _outer_ring_coordinates(self) -> list[Tuple[float, float, float, float]]:
+        """ Coordinates (x_0, y_0, x_1, y_1) of the outer half edges, cached until the outer cycle changes. """
+        if self._outer_ring is None:
+            coordinates = [(edge._origin._point.x, edge._origin._point.y) for edge in self._outer_cycle()]
+            self._outer_ring = [(x_0, y_0, x_1, y_1) for (x_0, y_0), (x_1, y_1)
+                                in zip(coordinates, coordinates[1:] + coordinates[:1])]
+        return self._outer_ring
+
     def contains(self, search_point: Point) -> bool:
-        # Ray Casting Algorithm
+        # Ray Casting Algorithm: Count the edges crossed by a ray going left from the search point.
+        # Vertices on the height of the ray count as lying above it, so a vertex touched by the ray is counted once.
+        bounding_box = self.bounding_box
+        if bounding_box is None or not bounding_box.contains(search_point):
+            return False
+        x, y = search_point.x, search_point.y
         inside = False
-        ray = LineSegment(Point(-EPSILON, search_point.y), search_point)
-        for edge in self.outer_half_edges():
-            ls = LineSegment(edge.origin.point, edge.destination.point)
-            intersection = ls.intersection(ray)
-            if isinstance(intersection, Point) and \
-                    (intersection != edge.origin.point or edge.destination.point.y < search_point.y) and \
-                    (intersection != edge.destination.point or edge.origin.point.y < search_point.y):
+        for x_0, y_0, x_1, y_1 in self._outer_ring_coordinates():
+            if (y_0 >= y) != (y_1 >= y) and x_0 + (y - y_0) * (x_1 - x_0) / (y_1 - y_0) <= x:
                 inside = not inside
         return inside
 
-    def is_convex(self) -> bool:
-        if len(self.outer_vertices()) < 3:
-            raise Exception("Convexitivity is illdefined for polygons of 2 or less vertices.")
+    def contains_many(self, search_points: Iterable[Point]) -> np.ndarray:
+        """ Vectorised contains() for many points at once. Returns a boolean array in the order of the points. """
+        points = np.array([(point.x, point.y) for point in search_points], dtype=float).reshape(-1, 2)
+        x_0, y_0, x_1, y_1 = np.array(self._outer_ring_coordinates(), dtype=float).reshape(-1, 4).T
+        xs, ys = points[:, :1], points[:, 1:]
+        crossing = (y_0 >= ys) != (y_1 >= ys)
+        with np.errstate(divide="ignore", invalid="ignore"):  # horizontal edges never cross
+            crossing_xs = x_0 + (ys - y_0) * (x_1 - x_0) / (y_1 - y_0)
+        return np.count_nonzero(crossing & (crossing_xs <= xs), axis=1) % 2 == 1
+
+    def is_convex(self, epsilon: float = EPSILON) -> bool:
+        if epsilon != EPSILON:
+            return self._compute_is_convex(epsilon)
+        if self._is_convex is None:
+            self._is_convex = self._compute_is_convex(epsilon)
+        return self._is_convex
+
+    def _compute_is_convex(self, epsilon: float) -> bool:
+        ring = self._outer_ring_coordinates()
+        if len(ring) < 3:  # no polygon, e.g. the outer face
+            return False
 
-        for edge in self.outer_half_edges():
-            if edge.next.destination.point.orientation(edge.origin.point, edge.destination.point) == ORT.RIGHT:
-                return False
-        return True
+        # Convex iff the anticlockwise outer cycle never turns right, i.e. no point lies right of the edge before it.
+        return not any((x_2 - x_0) * (y_1 - y_0) - (y_2 - y_0) * (x_1 - x_0) > epsilon
+                       for (x_0, y_0, x_1, y_1), (_, _, x_2, y_2) in zip(ring, ring[1:] + ring[:1]))
 
     def __repr__(self) -> str:
         if self.is_outer:
@@ -1,12 +1,18 @@
 from __future__ import annotations
 from abc import ABC, abstractmethod
 from typing import Optional, Iterable, Union
+from itertools import count
+import gc
 import random
 
-from ..geometry import LineSegment, Point, PointReference, VerticalOrientation as VORT, HorizontalOrientation as HORT, Rectangle, PointSequence
+from ..geometry import EPSILON, LineSegment, Point, PointReference, VerticalOrientation as VORT, HorizontalOrientation as HORT, Rectangle, PointSequence
 from .objects import Face
 from .dcel import DoublyConnectedEdgeList
 
+# Enum members bound once, looking them up on the enum classes is comparatively slow in the hot loops below
+_ABOVE, _BELOW, _ON = VORT.ABOVE, VORT.BELOW, VORT.ON
+_LEFT, _EQUAL, _RIGHT = HORT.LEFT, HORT.EQUAL, HORT.RIGHT
+
 class PLSearchStructure(ABC):
     def query(self, point: Point) -> tuple[Face, PointSequence]:
         pass
@@ -37,51 +43,80 @@ class PointLocation2:
         initial_face = self._vertical_decomposition._trapezoids[0]
         self._search_structure: PLSearchStructure = VDSearchStructure(initial_face)
         # Randomized Incremental Construction
-        self.build_vertical_decomposition(PointLocation.dcel_prepocessing(self._dcel), random_seed)
+        self.build_vertical_decomposition(self.dcel_prepocessing(self._dcel), random_seed)
+
+    def check_structure(self, trapezoids: Optional[Iterable[VDFace]] = None):
+        """Validate the vertical decomposition and the search structure. Skipped when running with python -O.
+
+        If trapezoids are given (e.g. the ones returned by insert), only these, their neighbors and their
+        search leafs (with the leafs' parents) are checked. Given trapezoids which are no longer part of the
+        vertical decomposition are ignored.
+        """
+        if not __debug__:
+            return
+        all_trapezoids = self._vertical_decomposition.trapezoids
+        if trapezoids is None:
+            checked_trapezoids = all_trapezoids
+        else:
+            checked_trapezoids = {}  # Used as an ordered set
+            for trapezoid in trapezoids:
+                if trapezoid._index < len(all_trapezoids) and all_trapezoids[trapezoid._index] is trapezoid:
+                    checked_trapezoids[trapezoid] = None
+                    checked_trapezoids.update((neighbor, None) for neighbor in trapezoid.neighbors if neighbor is not None)
 
-    def check_structure(self):
         # --- Vertical Decompostion ---
-        for trapezoid in self._vertical_decomposition.trapezoids:
+        left_bound, right_bound = self._bounding_box.left, self._bounding_box.right
+        for trapezoid in checked_trapezoids:
+            if not 0 <= trapezoid._index < len(all_trapezoids) or all_trapezoids[trapezoid._index] is not trapezoid:
+                raise RuntimeError(f"Wrong index {trapezoid._index} of trapezoid {trapezoid}")
+            upper_right, upper_left, lower_left, lower_right = trapezoid.neighbors
+            left_point, right_point = trapezoid.left_point, trapezoid.right_point
+            top, bottom = trapezoid.top_line_segment, trapezoid.bottom_line_segment
+            left_on_top, left_on_bottom = left_point is top.left, left_point is bottom.left
+            right_on_top, right_on_bottom = right_point is top.right, right_point is bottom.right
+
             # Neighbors:
             # Wrongly None
-            if trapezoid.left_point is not trapezoid.top_line_segment.left and trapezoid.left_point.x > self._bounding_box.left and trapezoid.upper_left_neighbor is None:
+            if not left_on_top and left_point.x > left_bound and upper_left is None:
                 raise RuntimeError(f"Upper left neighbor necessary in trapezoid {trapezoid}")
-            if trapezoid.left_point is not trapezoid.bottom_line_segment.left and trapezoid.left_point.x > self._bounding_box.left and trapezoid.lower_left_neighbor is None:
+            if not left_on_bottom and left_point.x > left_bound and lower_left is None:
                 raise RuntimeError(f"Lower left neighbor necessary in trapezoid {trapezoid}")
-            if trapezoid.right_point is not trapezoid.top_line_segment.right and trapezoid.right_point.x < self._bounding_box.right and trapezoid.upper_right_neighbor is None:
+            if not right_on_top and right_point.x < right_bound and upper_right is None:
                 raise RuntimeError(f"Upper right neighbor necessary in trapezoid {trapezoid}")
-            if trapezoid.right_point is not trapezoid.bottom_line_segment.right and trapezoid.right_point.x < self._bounding_box.right and trapezoid.lower_right_neighbor is None:
+            if not right_on_bottom and right_point.x < right_bound and lower_right is None:
                 raise RuntimeError(f"Lower right neighbor necessary in trapezoid {trapezoid}")
 
             # Wrongly not None
-            if trapezoid.left_point is trapezoid.top_line_segment.left and trapezoid.upper_left_neighbor is not None:
+            if left_on_top and upper_left is not None:
                 raise RuntimeError(f"Not allowed upper left neighbor in trapezoid {trapezoid}")
-            if trapezoid.left_point is trapezoid.bottom_line_segment.left and trapezoid.lower_left_neighbor is not None:
+            if left_on_bottom and lower_left is not None:
                 raise RuntimeError(f"Not allowed lower left neighbor in trapezoid {trapezoid}")
-            if trapezoid.right_point is trapezoid.top_line_segment.right and trapezoid.upper_right_neighbor is not None:
+            if right_on_top and upper_right is not None:
                 raise RuntimeError(f"Not allowed upper right neighbor in trapezoid {trapezoid}")
-            if trapezoid.right_point is trapezoid.bottom_line_segment.right and trapezoid.lower_right_neighbor is not None:
+            if right_on_bottom and lower_right is not None:
                 raise RuntimeError(f"Not allowed lower right neighbor in trapezoid {trapezoid}")
 
-            # Pairwise connection
-            if trapezoid.upper_right_neighbor is not None and trapezoid.upper_right_neighbor.upper_left_neighbor is not trapezoid:
-                raise RuntimeError(f"Issue with upper right neighbor in trapezoid {trapezoid}")
-            if trapezoid.upper_left_neighbor is not None and trapezoid.upper_left_neighbor.upper_right_neighbor is not trapezoid:
-                raise RuntimeError(f"Issue with upper left neighbor in trapezoid {trapezoid}")
-            if trapezoid.lower_right_neighbor is not None and trapezoid.lower_right_neighbor.lower_left_neighbor is not trapezoid:
-                raise RuntimeError(f"Issue with lower right neighbor in trapezoid {trapezoid}")
-            if trapezoid.lower_left_neighbor is not None and trapezoid.lower_left_neighbor.lower_right_neighbor is not trapezoid:
-                raise RuntimeError(f"Issue with lower left neighbor {trapezoid.lower_left_neighbor} in trapezoid {trapezoid}")
-            
-            # Pairwise neighbors: "connection" points
-            if trapezoid.upper_right_neighbor is not None and trapezoid.upper_right_neighbor.left_point is not trapezoid.right_point:
-                raise RuntimeError(f"Issue in the pair of right point of {trapezoid} and the left point of its upper right neighbor")
-            if trapezoid.lower_right_neighbor is not None and trapezoid.lower_right_neighbor.left_point is not trapezoid.right_point:
-                raise RuntimeError(f"Issue in the pair of right point of {trapezoid} and the left point of its lower right neighbor")
-            if trapezoid.upper_left_neighbor is not None and trapezoid.upper_left_neighbor.right_point is not trapezoid.left_point:
-                raise RuntimeError(f"Issue in the pair of left point of {trapezoid} and the right point of its upper left neighbor")
-            if trapezoid.lower_left_neighbor is not None and trapezoid.lower_left_neighbor.right_point is not trapezoid.left_point:
-                raise RuntimeError(f"Issue in the pair of left point of {trapezoid} and the right point of its lower left neighbor")
+            # Pairwise connection and "connection" points
+            if upper_right is not None:
+                if upper_right.upper_left_neighbor is not trapezoid:
+                    raise RuntimeError(f"Issue with upper right neighbor in trapezoid {trapezoid}")
+                if upper_right.left_point is not right_point:
+                    raise RuntimeError(f"Issue in the pair of right point of {trapezoid} and the left point of its upper right neighbor")
+            if upper_left is not None:
+                if upper_left.upper_right_neighbor is not trapezoid:
+                    raise RuntimeError(f"Issue with upper left neighbor in trapezoid {trapezoid}")
+                if upper_left.right_point is not left_point:
+                    raise RuntimeError(f"Issue in the pair of left point of {trapezoid} and the right point of its upper left neighbor")
+            if lower_right is not None:
+                if lower_right.lower_left_neighbor is not trapezoid:
+                    raise RuntimeError(f"Issue with lower right neighbor in trapezoid {trapezoid}")
+                if lower_right.left_point is not right_point:
+                    raise RuntimeError(f"Issue in the pair of right point of {trapezoid} and the left point of its lower right neighbor")
+            if lower_left is not None:
+                if lower_left.lower_right_neighbor is not trapezoid:
+                    raise RuntimeError(f"Issue with lower left neighbor {lower_left} in trapezoid {trapezoid}")
+                if lower_left.right_point is not left_point:
+                    raise RuntimeError(f"Issue in the pair of left point of {trapezoid} and the right point of its lower left neighbor")
 
             # Search Leaf:
             if trapezoid.search_leaf is None:
@@ -92,7 +127,13 @@ class PointLocation2:
         # --- Search Structure ---
         if len(self._search_structure._root.parents) != 0:
             raise RuntimeError(f"Root of search structure has parents")
-        self._search_structure._root.check_structure()
+        if trapezoids is None:
+            self._search_structure._root.check_structure()
+        else:
+            for trapezoid in checked_trapezoids:
+                trapezoid.search_leaf._check_node()
+                for parent in trapezoid.search_leaf.parents:
+                    parent._check_node()
 
     def clear(self):
         self.clear_vertical_decomposition()
@@ -103,9 +144,10 @@ class PointLocation2:
         initial_face = self._vertical_decomposition._trapezoids[0]
         self._search_structure = VDSearchStructure(initial_face)
 
-    def insert(self, line_segment: VDLineSegment) -> None:
+    def insert(self, line_segment: VDLineSegment) -> list[VDFace]:
+        """Insert the line segment and return all trapezoids that were removed, created or changed by it."""
         # Get necessary information
-        left_point_face = self._search_structure.root.search(line_segment.left, line_segment)
+        left_point_face = self._search_structure.search(line_segment.left, line_segment)
 
         # 1. Update the vertical decomposition
         unvalid_trapezoids, new_trapezoids = self._vertical_decomposition.update(line_segment, left_point_face)
@@ -114,15 +156,15 @@ class PointLocation2:
         unvalid_leafs = [trapezoid.search_leaf for trapezoid in unvalid_trapezoids]
         new_leafs = [VDLeaf(trapezoid) if trapezoid is not None else None for trapezoid in new_trapezoids]
         self._search_structure.update(line_segment, unvalid_leafs, new_leafs)
+        return unvalid_trapezoids + [trapezoid for trapezoid in new_trapezoids if trapezoid is not None]
 
     @classmethod
     def dcel_prepocessing(cls, dcel: DoublyConnectedEdgeList) -> Iterable[VDLineSegment]:
         segments: list[VDLineSegment] = []
         for edge in dcel.edges:
-            if edge.origin == edge.destination:
-                continue
-            if edge.origin is edge.left_and_right[0]:  # Make sure only one of each Halfedges is used
-                ls = VDLineSegment(edge.origin.point, edge.destination.point)
+            p, q = edge.origin.point, edge.destination.point
+            if p.x < q.x or (p.x == q.x and p.y < q.y):  # Make sure only one of each Halfedges is used (the one starting at the left endpoint, i.e. edge.left_and_right[0]). This also skips single vertices.
+                ls = VDLineSegment(p, q)
                 ls.above_face = edge.incident_face
                 segments.append(ls)
         return segments
@@ -130,14 +172,27 @@ class PointLocation2:
 
     def build_vertical_decomposition(self, segments: Iterable[LineSegment], random_seed: Optional[int] = None) -> VerticalDecomposition:
         self.clear_vertical_decomposition()
-        # Randomized incremental construction
-        if random_seed is not None:
-            random.seed(random_seed)
-        random.shuffle(segments)
-        for segment in segments:
-            self.insert(segment)
-            # self.check_structure()  # Just for testing, takes a considerable amount of time
-            # print(f"Check successful after insertion of LS {segment}")
+        self.extend_vertical_decomposition(segments, random_seed)
+
+    def extend_vertical_decomposition(self, segments: Iterable[LineSegment], random_seed: Optional[int] = None):
+        """Insert further segments into the current vertical decomposition and search structure, without rebuilding them.
+
+        The new segments must not intersect each other or the already inserted segments (apart from shared endpoints).
+        """
+        # Randomized incremental construction (shuffle a copy with a local generator, leaving the caller's list and the global seed alone)
+        segments = list(segments)
+        random.Random(random_seed).shuffle(segments)
+        # The many small, mutually referencing trapezoids and nodes repeatedly trigger the cyclic garbage collector, although nothing is freed during the build.
+        gc_was_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            for segment in segments:
+                changed_trapezoids = self.insert(segment)
+                # self.check_structure(changed_trapezoids)  # Just for testing, self.check_structure() checks everything but takes a considerable amount of time
+                # print(f"Check successful after insertion of LS {segment}")
+        finally:
+            if gc_was_enabled:
+                gc.enable()
 
 
 class VerticalDecomposition(PlanarSubdivision):
@@ -153,10 +208,11 @@ class VerticalDecomposition(PlanarSubdivision):
 
         top = VDLineSegment(upper_left, upper_right)
         bottom = VDLineSegment(lower_left, lower_right)
-        bottom._above_dcel_face = dcel.outer_face
+        bottom.above_face = dcel.outer_face
         initial_trapezoid = VDFace(top, bottom, upper_left, upper_right)
-        self._trapezoids.append(initial_trapezoid)
+        self._add_trapezoids([initial_trapezoid])
         self._point_sequence: PointSequence = PointSequence()
+        self._point_sequence_index: dict[Point, int] = {}  # Position of each endpoint's entry in the point sequence (replaces the linear PointSequence._find)
 
     # region properties
 
@@ -176,27 +232,36 @@ class VerticalDecomposition(PlanarSubdivision):
         Returns both the now unvalid trapezoids and the newly created / changed trapezoids
         (a trapzoid may be in both lists)        
         """
-        self.line_segments.append(line_segment)
+        self._line_segments.append(line_segment)
+        left, right = line_segment.left, line_segment.right
+        point_sequence = self._point_sequence
 
-        self._point_sequence.animate(PointReference([line_segment.left, line_segment.right], 0))
+        point_sequence.animate(PointReference([left, right], 0))
 
         # Find all other k intersected trapezoids (via neighbors) in O(k) time (see [1], page 130)
         intersected_trapezoids: list[VDFace] = []  # Does not include the left_point_face
+        # Vertical orientation of each visited right point w.r.t. the LS. The right point of one trapezoid is the left point of the next one in the chain, so these are reused below.
+        orientations: list[VORT] = []
         last_intersected = left_point_face
-        while line_segment.right.horizontal_orientation(last_intersected.right_point) == HORT.RIGHT:  # ls extends to the right of the last added trapezoid
-            if last_intersected.right_point.vertical_orientation(line_segment) == VORT.BELOW:  # Tests for vertical orientation is the same for the transformed instance using the shear transform phi
+        right_x, right_y = right.x, right.y
+        chain_point = last_intersected.right_point
+        while right_x > chain_point.x or (right_x == chain_point.x and right_y > chain_point.y):  # ls extends to the right of the last added trapezoid (HORT.RIGHT)
+            orientation = chain_point.vertical_orientation(line_segment)
+            orientations.append(orientation)
+            if orientation is _BELOW:  # Tests for vertical orientation is the same for the transformed instance using the shear transform phi
                 last_intersected = last_intersected.upper_right_neighbor
             else:  # vertical_orientation == VORT.ABOVE, VORT.ON is impossible
                 last_intersected = last_intersected.lower_right_neighbor
 
             intersected_trapezoids.append(last_intersected)
+            chain_point = last_intersected.right_point
             
-        if intersected_trapezoids == []:
+        if not intersected_trapezoids:
             # Simple case: the "line_segment" is completely contained in the trapezoid "left_point_face"
             # The trapezoid is replaced by up to four new trapezoids (see [1], page 131)
             trapezoid_left, trapezoid_top, trapezoid_bottom, trapezoid_right = self._partition_trapezoid(left_point_face, line_segment)
-            self._trapezoids.remove(left_point_face)
-            self._trapezoids.extend(list(filter(None.__ne__, [trapezoid_left, trapezoid_top, trapezoid_bottom, trapezoid_right])))
+            self._remove_trapezoid(left_point_face)
+            self._add_trapezoids([trapezoid for trapezoid in (trapezoid_left, trapezoid_top, trapezoid_bottom, trapezoid_right) if trapezoid is not None])
             return [left_point_face], [trapezoid_left, trapezoid_top, trapezoid_bottom, trapezoid_right]
 
         # Other (more complicated) case: the "line_segment" intersects two or more trapezoids (Update in O(k) time)
@@ -208,34 +273,36 @@ class VerticalDecomposition(PlanarSubdivision):
 
         # Partition the first trapezoid (containing the left endpoint)
         left_face, left_face_above, left_face_below, _ = self._partition_trapezoid(left_point_face, line_segment)
-        self.trapezoids.remove(left_point_face)
+        self._remove_trapezoid(left_point_face)
         if left_face is not None:
-            self.trapezoids.append(left_face)
+            self._add_trapezoids([left_face])
 
-        if left_point_face.right_point.vertical_orientation(line_segment) == VORT.ABOVE:  # Setting the top/bottom most neighbor
+        if orientations[0] is _ABOVE:  # Setting the top/bottom most neighbor
             left_face_above.upper_right_neighbor = upper_right
-        elif left_point_face.right_point.vertical_orientation(line_segment) ==  VORT.BELOW:
+        elif orientations[0] is _BELOW:
             left_face_below.lower_right_neighbor = lower_right
         else:
             raise RuntimeError(f"Point {left_point_face.right_point} must not lie on line induced by the line segment {line_segment}")
 
         # Partition the last trapezoid (containing the right endpoint)
         _, right_face_above, right_face_below, right_face = self._partition_trapezoid(right_point_face, line_segment)
-        self.trapezoids.remove(right_point_face)
+        self._remove_trapezoid(right_point_face)
         if right_face is not None:
-            self.trapezoids.append(right_face)
+            self._add_trapezoids([right_face])
 
         # Shorten vertical extensions that abut on the LS. => Merge trapezoids along the line-segment. (see [1], page 132)
         last_face_above, last_face_below = left_face_above, left_face_below
-        for trapezoid in intersected_trapezoids:
-            last_face_above, last_face_below = self._merge_trapezoids(trapezoid, line_segment, last_face_above, last_face_below)
+        for i, trapezoid in enumerate(intersected_trapezoids):
+            last_face_above, last_face_below = self._merge_trapezoids(trapezoid, line_segment, last_face_above, last_face_below, orientations[i], orientations[i + 1])
 
         # Merge with (already split) last trapezoid
-        self._point_sequence.animate(right_face_above.left_point)
-        seq_point = self._point_sequence[right_face_above.left_point].copy()
-        if right_face_above.left_point.vertical_orientation(line_segment) == VORT.ABOVE:  # point is the original leftp of right_point_face (equal in right_face_below)
+        merge_point = right_face_above.left_point
+        point_sequence.animate(merge_point)
+        seq_index = self._point_sequence_index[merge_point]
+        seq_point = point_sequence[seq_index].copy()
+        if orientations[-1] is _ABOVE:  # point is the original leftp of right_point_face (equal in right_face_below)
             # Merge trapezoids below the LS and discard right_face_below
-            last_face_below.right_point = line_segment.right
+            last_face_below.right_point = right
             last_face_below.lower_right_neighbor = right_face_below.lower_right_neighbor  # the right_point_face if the right endpoint of the linesegment is new and its old lower_right_neighbor otherwise
             last_face_below.upper_right_neighbor = None
             
@@ -243,10 +310,10 @@ class VerticalDecomposition(PlanarSubdivision):
             right_face_above.upper_left_neighbor = upper_left  # Connect even higher neighbor
             kept_face = right_face_above
             if isinstance(seq_point, PointReference):
-                seq_point.container[2] = Point(right_face_above.left_point.x, line_segment.y_from_x(right_face_above.left_point.x))
-        elif right_face_above.left_point.vertical_orientation(line_segment) == VORT.BELOW:
+                seq_point.container[2] = Point(merge_point.x, line_segment.y_from_x(merge_point.x))
+        elif orientations[-1] is _BELOW:
             # Merge trapezoids above the LS and discard right_face_above
-            last_face_above.right_point = line_segment.right
+            last_face_above.right_point = right
             last_face_above.lower_right_neighbor = None
             last_face_above.upper_right_neighbor = right_face_above.upper_right_neighbor
             
@@ -254,58 +321,83 @@ class VerticalDecomposition(PlanarSubdivision):
             right_face_below.lower_left_neighbor = lower_left
             kept_face = right_face_below
             if isinstance(seq_point, PointReference):
-                seq_point.container[1] = Point(right_face_above.left_point.x, line_segment.y_from_x(right_face_above.left_point.x))
+                seq_point.container[1] = Point(merge_point.x, line_segment.y_from_x(merge_point.x))
         else:
-            raise RuntimeError(f"Point {trapezoid.left_point} must not lie on line induced by the line segment {line_segment}")
+            raise RuntimeError(f"Point {merge_point} must not lie on line induced by the line segment {line_segment}")
         
-        self._point_sequence[right_face_above.left_point] = seq_point
+        point_sequence[seq_index] = seq_point
         
-        self._trapezoids.extend([left_face_above, left_face_below, kept_face])
+        self._add_trapezoids([left_face_above, left_face_below, kept_face])
         return [left_point_face] + intersected_trapezoids + [right_point_face], [left_face, left_face_above, left_face_below, kept_face, right_face]
 
+    def _add_trapezoids(self, faces: list[VDFace]):
+        for face in faces:
+            face._index = len(self._trapezoids)
+            self._trapezoids.append(face)
+
+    def _remove_trapezoid(self, face: VDFace):
+        """Remove in O(1) by moving the last trapezoid into the freed slot (the order of the trapezoids is not meaningful)."""
+        last = self._trapezoids.pop()
+        if last is not face:
+            self._trapezoids[face._index] = last
+            last._index = face._index
+
+    def _append_to_point_sequence(self, point: PointReference):
+        self._point_sequence_index.setdefault(point.point, len(self._point_sequence))
+        self._point_sequence.append(point)
+
     def _partition_trapezoid(self, face: VDFace, line_segment: VDLineSegment) -> tuple[Optional[VDFace], VDFace, VDFace, Optional[VDFace]]:
-        trapezoid_top = VDFace(face.top_line_segment, line_segment, line_segment.left, line_segment.right)
-        trapezoid_bottom = VDFace(line_segment, face.bottom_line_segment, line_segment.left, line_segment.right)
-        if (hort := line_segment.left.horizontal_orientation(face.left_point)) == HORT.LEFT:  # Case ls extends further to the left
+        left, right = line_segment.left, line_segment.right
+        top, bottom = face.top_line_segment, face.bottom_line_segment
+        face_left, face_right = face.left_point, face.right_point
+        trapezoid_top = VDFace(top, line_segment, left, right)
+        trapezoid_bottom = VDFace(line_segment, bottom, left, right)
+        if (hort := left.horizontal_orientation(face_left)) is _LEFT:  # Case ls extends further to the left
             trapezoid_left = None
-            trapezoid_top.left_point = face.left_point
-            trapezoid_bottom.left_point = face.left_point
-        elif hort == HORT.EQUAL:   # Case where the new linesegment shares an endpoint with an already existing endpoint
+            trapezoid_top.left_point = face_left
+            trapezoid_bottom.left_point = face_left
+        elif hort is _EQUAL:   # Case where the new linesegment shares an endpoint with an already existing endpoint
             trapezoid_left = None
             trapezoid_top.upper_left_neighbor = face.upper_left_neighbor
             trapezoid_bottom.lower_left_neighbor = face.lower_left_neighbor
-            self._point_sequence.animate(line_segment.left)
+            self._point_sequence.animate(left)
         else:
-            trapezoid_left = VDFace(face.top_line_segment, face.bottom_line_segment, face.left_point, line_segment.left)
+            trapezoid_left = VDFace(top, bottom, face_left, left)
             trapezoid_left.neighbors = [trapezoid_top, face.upper_left_neighbor, face.lower_left_neighbor, trapezoid_bottom]
-            point_above = Point(line_segment.left.x, face.top_line_segment.y_from_x(line_segment.left.x))
-            point_below = Point(line_segment.left.x, face.bottom_line_segment.y_from_x(line_segment.left.x))
-            self._point_sequence.append(PointReference([line_segment.left, point_above.copy(), point_below.copy()], 0))  # For animations: copy(), because the values might change later.
+            x = left.x
+            point_above = Point(x, top.y_from_x(x))
+            point_below = Point(x, bottom.y_from_x(x))
+            self._append_to_point_sequence(PointReference([left, point_above.copy(), point_below.copy()], 0))  # For animations: copy(), because the values might change later.
         
-        if (hort := line_segment.right.horizontal_orientation(face.right_point)) == HORT.RIGHT:
+        if (hort := right.horizontal_orientation(face_right)) is _RIGHT:
             trapezoid_right = None
-            trapezoid_top.right_point = face.right_point
-            trapezoid_bottom.right_point = face.right_point
-        elif hort == HORT.EQUAL:
+            trapezoid_top.right_point = face_right
+            trapezoid_bottom.right_point = face_right
+        elif hort is _EQUAL:
             trapezoid_right = None
             trapezoid_top.upper_right_neighbor = face.upper_right_neighbor
             trapezoid_bottom.lower_right_neighbor = face.lower_right_neighbor
-            self._point_sequence.animate(line_segment.right)
+            self._point_sequence.animate(right)
         else:
-            trapezoid_right = VDFace(face.top_line_segment, face.bottom_line_segment, line_segment.right, face.right_point)
+            trapezoid_right = VDFace(top, bottom, right, face_right)
             trapezoid_right.neighbors = [face.upper_right_neighbor, trapezoid_top, trapezoid_bottom, face.lower_right_neighbor]
-            point_above = Point(line_segment.right.x, face.top_line_segment.y_from_x(line_segment.right.x))
-            point_below = Point(line_segment.right.x, face.bottom_line_segment.y_from_x(line_segment.right.x))
-            self._point_sequence.append(PointReference([line_segment.right, point_above.copy(), point_below.copy()], 0))
+            x = right.x
+            point_above = Point(x, top.y_from_x(x))
+            point_below = Point(x, bottom.y_from_x(x))
+            self._append_to_point_sequence(PointReference([right, point_above.copy(), point_below.copy()], 0))
 
         return trapezoid_left, trapezoid_top, trapezoid_bottom, trapezoid_right
     
-    def _merge_trapezoids(self, trapezoid: VDFace, line_segment: VDLineSegment, last_above: VDFace, last_below: VDFace):
-        self._point_sequence.animate(trapezoid.left_point)
-        seq_point = self._point_sequence[trapezoid.left_point].copy()
-        if trapezoid.left_point.vertical_orientation(line_segment) == VORT.ABOVE:
+    def _merge_trapezoids(self, trapezoid: VDFace, line_segment: VDLineSegment, last_above: VDFace, last_below: VDFace,
+                          left_orientation: VORT, right_orientation: VORT):
+        """Merge along the LS, given the (already computed) vertical orientations of the trapezoid's left and right point."""
+        point_sequence = self._point_sequence
+        point_sequence.animate(trapezoid.left_point)
+        seq_index = self._point_sequence_index[trapezoid.left_point]
+        seq_point = point_sequence[seq_index].copy()
+        if left_orientation is _ABOVE:
             # Merge trapezoids below the LS
-            if trapezoid.right_point.vertical_orientation(line_segment) == VORT.BELOW:  # Next one is on the other side, new neighbors are correct and final
+            if right_orientation is _BELOW:  # Next one is on the other side, new neighbors are correct and final
                 last_below.lower_right_neighbor = trapezoid.lower_right_neighbor
                 last_below.upper_right_neighbor = trapezoid.upper_right_neighbor
             last_below.right_point = trapezoid.right_point
@@ -316,9 +408,9 @@ class VerticalDecomposition(PlanarSubdivision):
             last_above = trapezoid
             if isinstance(seq_point, PointReference):
                 seq_point.container[2] = Point(trapezoid.left_point.x, line_segment.y_from_x(trapezoid.left_point.x))
-        elif trapezoid.left_point.vertical_orientation(line_segment) == VORT.BELOW:
+        elif left_orientation is _BELOW:
             # Merge trapezoids above the LS
-            if trapezoid.right_point.vertical_orientation(line_segment) == VORT.ABOVE:
+            if right_orientation is _ABOVE:
                 last_above.lower_right_neighbor = trapezoid.lower_right_neighbor
                 last_above.upper_right_neighbor = trapezoid.upper_right_neighbor
             last_above.right_point = trapezoid.right_point
@@ -331,19 +423,19 @@ class VerticalDecomposition(PlanarSubdivision):
                 seq_point.container[1] = Point(trapezoid.left_point.x, line_segment.y_from_x(trapezoid.left_point.x))
         else:
             raise RuntimeError(f"Point {trapezoid.left_point} must not lie on line induced by the line segment {line_segment}")
-        self._point_sequence[trapezoid.left_point] = seq_point
+        point_sequence[seq_index] = seq_point
         return last_above, last_below
 
             
 class VDNode(ABC):
-    __id = 0
+    __slots__ = ("_left", "_right", "_parents", "_id")
+    __ids = count()
 
     def __init__(self) -> None:
         self._left: Optional[VDNode] = None
         self._right: Optional[VDNode] = None
         self._parents: list[VDNode] = []  # The search structure is a DAG, hence a node can have multiple parents
-        self._id = VDNode.__id
-        VDNode.__id = VDNode.__id + 1
+        self._id = next(VDNode.__ids)
     
     # region properties
 
@@ -353,7 +445,7 @@ class VDNode(ABC):
     
     @property
     def parent(self) -> Optional[VDNode]:
-        if self._parents == []:
+        if not self._parents:
             return None
         return self._parents[0]
 
@@ -366,6 +458,20 @@ class VDNode(ABC):
     # endregion
 
     def check_structure(self):
+        """Check this node and all nodes below it. Nodes shared in the DAG are only checked once."""
+        visited: set[VDNode] = set()
+        stack: list[VDNode] = [self]
+        while stack:
+            node = stack.pop()
+            if node in visited:
+                continue
+            visited.add(node)
+            node._check_node()
+            if node._left is not None:
+                stack.append(node._left)
+                stack.append(node._right)
+
+    def _check_node(self):
         if isinstance(self, VDLeaf):
             if self._left is not None or self._right is not None:
                 raise RuntimeError(f"Leaf is not supposed to have children")
@@ -386,12 +492,10 @@ class VDNode(ABC):
                 raise RuntimeError(f"Inner node {self} needs to be a parent of its left child")
             if self not in self._right.parents:
                 raise RuntimeError(f"Inner node {self} needs to be a parent of its right child")
-            self._left.check_structure()
-            self._right.check_structure()
 
 
     @abstractmethod
-    def search(self, point: Point, line_segment: Optional[VDLineSegment] = None, point_sequence = PointSequence()) -> VDFace:
+    def search(self, point: Point, line_segment: Optional[VDLineSegment] = None, point_sequence: Optional[PointSequence] = None) -> VDFace:
         """Search/Query method for the search structure of the vertical decompostion.
         
         Parameters
@@ -400,11 +504,23 @@ class VDNode(ABC):
             The point to search (query) in the Vertical Decomposition
         line_segment : Optional[VDLineSegment]
             Used during insertion by a y-node when the searched point lies on the line-segment (=> shared left endpoint) to compare the slope of both line segments
+        point_sequence : Optional[PointSequence]
+            Records the visited nodes for animations, nothing is recorded if None
         """
         pass
 
+    def _set_new_children(self, left: VDNode, right: VDNode):
+        """Set both children (left/lower and right/upper) of a freshly created inner node.
+        
+        Skips the checks of the child setters: a new node cannot be a parent of its children yet.
+        """
+        self._left = left
+        self._right = right
+        left._parents.append(self)
+        right._parents.append(self)
+
     def replace_with(self, new_node: VDNode) -> bool:
-        if self._parents == []:  # node is the root
+        if not self._parents:  # node is the root
             return False
         for parent in self._parents:
             if parent._left is self:
@@ -423,6 +539,8 @@ class VDNode(ABC):
 
 
 class VDXNode(VDNode):
+    __slots__ = ("_point",)
+
     def __init__(self, point: Point) -> None:
         super().__init__()
         self._point: Point = point
@@ -436,7 +554,7 @@ class VDXNode(VDNode):
     @left.setter
     def left(self, left: Optional[VDNode]):
         self._left = left
-        if left != None:
+        if left is not None:
             left.parent = self
 
     @property
@@ -446,20 +564,27 @@ class VDXNode(VDNode):
     @right.setter
     def right(self, right: Optional[VDNode]):
         self._right = right
-        if right != None:
+        if right is not None:
             right.parent = self
 
     # endregion
 
-    def search(self, point: Point, line_segment: Optional[VDLineSegment] = None, point_sequence = PointSequence()) -> VDFace:
-        point_sequence.append(self._point)
-        if point.horizontal_orientation(self._point) == HORT.LEFT:  # Using symbolic shear transform
-            return self._left.search(point, line_segment, point_sequence)
+    def search(self, point: Point, line_segment: Optional[VDLineSegment] = None, point_sequence: Optional[PointSequence] = None) -> VDFace:
+        return self._child(point, line_segment, point_sequence).search(point, line_segment, point_sequence)
+
+    def _child(self, point: Point, line_segment: Optional[VDLineSegment], point_sequence: Optional[PointSequence]) -> VDNode:
+        if point_sequence is not None:
+            point_sequence.append(self._point)
+        node_point = self._point
+        if point.x < node_point.x or (point.x == node_point.x and point.y < node_point.y):  # HORT.LEFT, using symbolic shear transform (see Point.horizontal_orientation)
+            return self._left
         else:  # The point lies to the right or coincides with the point of the node. Then we decide to continue to the right ([1], page 130 last paragraph). Durint insertion this results in a trapezoid of 0 width.
-            return self._right.search(point, line_segment, point_sequence)
+            return self._right
 
 
 class VDYNode(VDNode):
+    __slots__ = ("_line_segment",)
+
     def __init__(self, line_segment: VDLineSegment) -> None:
         super().__init__()
         self._line_segment: VDLineSegment = line_segment
@@ -473,7 +598,7 @@ class VDYNode(VDNode):
     @lower.setter
     def lower(self, lower: Optional[VDNode]):
         self._left = lower
-        if lower != None:
+        if lower is not None:
             lower.parent = self
 
     @property
@@ -483,31 +608,46 @@ class VDYNode(VDNode):
     @upper.setter
     def upper(self, upper: Optional[VDNode]):
         self._right = upper
-        if upper != None:
+        if upper is not None:
             upper.parent = self
 
     # endregion
 
-    def search(self, point: Point, line_segment: Optional[VDLineSegment] = None, point_sequence = PointSequence()) -> VDFace:
-        point_sequence.append(PointReference([self._line_segment.left, self._line_segment.right], 0))
-        cr = point.vertical_orientation(self._line_segment)
+    def search(self, point: Point, line_segment: Optional[VDLineSegment] = None, point_sequence: Optional[PointSequence] = None) -> VDFace:
+        return self._child(point, line_segment, point_sequence).search(point, line_segment, point_sequence)
+
+    def _child(self, point: Point, line_segment: Optional[VDLineSegment], point_sequence: Optional[PointSequence]) -> VDNode:
+        if point_sequence is not None:
+            point_sequence.append(PointReference([self._line_segment.left, self._line_segment.right], 0))
+        node_ls = self._line_segment
+        if node_ls._dx == 0:  # Vertical line segment
+            cr = point.vertical_orientation(node_ls)
+        else:  # Same test as Point.vertical_orientation, without building the enum member first
+            y_difference = node_ls.y_from_x(point.x) - point.y
+            if y_difference < -EPSILON:
+                return self._right
+            if y_difference > EPSILON:
+                return self._left
+            cr = _ON
 
         # During insertion: cr == VORT.ON can only happen if the new line segment shares its left endpoint with the ls stored at this node
-        if cr == VORT.ABOVE or (cr == VORT.ON and (line_segment is None or line_segment.slope() > self._line_segment.slope())):
-            return self.upper.search(point, line_segment, point_sequence)
-        elif cr == VORT.BELOW or (cr == VORT.ON and line_segment.slope() < self._line_segment.slope()):
-            return self.lower.search(point, line_segment, point_sequence)
+        if cr is _ABOVE or (cr is _ON and (line_segment is None or line_segment._slope > node_ls._slope)):
+            return self._right
+        elif cr is _BELOW or (cr is _ON and line_segment._slope < node_ls._slope):
+            return self._left
         else:
             raise AttributeError(f"The line segment {line_segment} cannot be inserted because it is already in the vertical decomposition")
 
 
 class VDLeaf(VDNode):
+    __slots__ = ("_face",)
+
     def __init__(self, face: VDFace) -> None:
         super().__init__()
         self._face: VDFace = face
         self._face.search_leaf = self
 
-    def search(self, point: Point, line_segment: Optional[VDLineSegment] = None, point_sequence = PointSequence()) -> VDFace:
+    def search(self, point: Point, line_segment: Optional[VDLineSegment] = None, point_sequence: Optional[PointSequence] = None) -> VDFace:
         return self._face
 
 
@@ -526,7 +666,7 @@ class VDSearchStructure(PLSearchStructure):
     def query(self, point: Point) -> tuple[Face, PointSequence]:
         point_sequence = PointSequence()
         point_sequence.append(point)
-        vd_face = self._root.search(point, point_sequence=point_sequence)
+        vd_face = self.search(point, point_sequence=point_sequence)
         dcel_face = vd_face.bottom_line_segment.above_face
         
         point_sequence.clear()
@@ -536,6 +676,18 @@ class VDSearchStructure(PLSearchStructure):
         for vertex in dcel_face.outer_vertices():
             point_sequence.append(vertex.point)
         return dcel_face, point_sequence
+
+    def query_many(self, points: Iterable[Point]) -> list[Face]:
+        """Query the faces of many points at once, without building the point sequences needed for the animations."""
+        search = self.search
+        return [search(point).bottom_line_segment.above_face for point in points]
+
+    def search(self, point: Point, line_segment: Optional[VDLineSegment] = None, point_sequence: Optional[PointSequence] = None) -> VDFace:
+        """Same as searching from the root (see VDNode.search), but descends in a loop instead of one recursive call per level."""
+        node = self._root
+        while node._left is not None:  # Only leafs have no children
+            node = node._child(point, line_segment, point_sequence)
+        return node._face
     
     def update(self, line_segment: VDLineSegment, unvalid_leafs: list[Optional[VDLeaf]], new_leafs: list[Optional[VDLeaf]]):
         """Update the search structure using known leafs from updating the vertical decomposition"""
@@ -549,50 +701,54 @@ class VDSearchStructure(PLSearchStructure):
         
         # Other (more complicated) case: the line segment intersects two or more trapezoids.
         # Replace the leaf containing the left endpoint by a small tree composed of an x- and a y-node.
-        left_endpoint_leaf = unvalid_leafs.pop(0)
+        left_endpoint_leaf = unvalid_leafs[0]
         tree = self._build_subtree(line_segment, new_leafs[0:3])
         left_endpoint_leaf.replace_with(tree)  # checking for success is not necessary. The leaf node "left_endpoint_leaf" cannot be the root as there are >= 2 total unvalid leafs
 
-        right_endpoint_leaf = unvalid_leafs.pop()  # leaf containing the right endpoint, filled after treatment of intersected trapezoids
+        right_endpoint_leaf = unvalid_leafs[-1]  # leaf containing the right endpoint, filled after treatment of intersected trapezoids
+        unvalid_leafs = unvalid_leafs[1:-1]  # leafs of the trapezoids in between (the caller's list is not changed)
 
+        kept_leaf = new_leafs[-2]
+        kept_face = kept_leaf._face
         opposite_leaf = None  # leaf corresponding to the trapezoid on the other side of the LS
-        if not unvalid_leafs == []:  # left and right point do not lie in directly neighboring faces
+        if unvalid_leafs:  # left and right point do not lie in directly neighboring faces
             # Init opposite_leaf: Either the leaf for left_face_above or left_face_below
             if unvalid_leafs[0]._face.bottom_line_segment is line_segment:
                 opposite_leaf = new_leafs[2]
             else:
                 opposite_leaf = new_leafs[1]
             opposite_leaf_orientation = opposite_leaf._face.right_point.vertical_orientation(line_segment)
+            orientations = line_segment.vertical_orientations([unvalid_leaf._face.left_point for unvalid_leaf in unvalid_leafs])
 
-            for i in range(0, len(unvalid_leafs)):  # Replace all unvalid leafs (beside first and last) by a single y-node
+            for i, unvalid_leaf in enumerate(unvalid_leafs):  # Replace all unvalid leafs (beside first and last) by a single y-node
                 tree = VDYNode(line_segment)
-                unvalid_leafs[i].replace_with(tree)
+                unvalid_leaf.replace_with(tree)
                 
-                unvalid_leaf_orientation = unvalid_leafs[i]._face.left_point.vertical_orientation(line_segment)
-                if unvalid_leaf_orientation == opposite_leaf_orientation:
+                unvalid_leaf_orientation = orientations[i]
+                if unvalid_leaf_orientation is opposite_leaf_orientation:
                     opposite_leaf = unvalid_leafs[i-1]
-                    opposite_leaf_orientation = opposite_leaf._face.left_point.vertical_orientation(line_segment)
+                    opposite_leaf_orientation = orientations[i-1]
 
-                if unvalid_leaf_orientation == VORT.ABOVE:
-                    tree.upper = unvalid_leafs[i]
+                if unvalid_leaf_orientation is _ABOVE:
+                    tree.upper = unvalid_leaf
                     tree.lower = opposite_leaf
                 else:  # VORT.BELOW
                     tree.upper = opposite_leaf
-                    tree.lower = unvalid_leafs[i]
+                    tree.lower = unvalid_leaf
 
-            if new_leafs[-2]._face.left_point.vertical_orientation(line_segment) == opposite_leaf_orientation:
+            if kept_face.left_point.vertical_orientation(line_segment) is opposite_leaf_orientation:
                 opposite_leaf = unvalid_leafs[-1]  # Maintain opposite leaf one more time
         else:
-            if new_leafs[-2]._face.bottom_line_segment is line_segment:
+            if kept_face.bottom_line_segment is line_segment:
                 opposite_leaf = new_leafs[2]
             else:
                 opposite_leaf = new_leafs[1]
 
         # Replace the leaf containing the right endpoint        
-        if new_leafs[-2]._face.bottom_line_segment is line_segment:  # kept_face is either right_face_above or right_face_below
-            tree = self._build_subtree(line_segment, [None, new_leafs[-2], opposite_leaf, new_leafs[-1]])
-        elif new_leafs[-2]._face.top_line_segment is line_segment:
-            tree = self._build_subtree(line_segment, [None, opposite_leaf, new_leafs[-2], new_leafs[-1]])
+        if kept_face.bottom_line_segment is line_segment:  # kept_face is either right_face_above or right_face_below
+            tree = self._build_subtree(line_segment, [None, kept_leaf, opposite_leaf, new_leafs[-1]])
+        elif kept_face.top_line_segment is line_segment:
+            tree = self._build_subtree(line_segment, [None, opposite_leaf, kept_leaf, new_leafs[-1]])
 
         right_endpoint_leaf.replace_with(tree)
 
@@ -601,76 +757,34 @@ class VDSearchStructure(PLSearchStructure):
             raise ValueError(f"The list of leafs {leafs} needs to be of length 3 or 4 to build a subtree.")
         # The leaf is replaced by a small tree composed of two x-nodes and a y-node
         tree = VDYNode(line_segment)
-        tree.upper = leafs[1]
-        tree.lower = leafs[2]
+        tree._set_new_children(leafs[2], leafs[1])
         if len(leafs) > 3 and leafs[3] is not None:  # The new line segment does not share an enpoint with an already existing endpoint
             child = tree
             tree = VDXNode(line_segment.right)
-            tree.left = child
-            tree.right = leafs[3]
+            tree._set_new_children(child, leafs[3])
         if leafs[0] is not None:
             child = tree
             tree = VDXNode(line_segment.left)
-            tree.left = leafs[0]
-            tree.right = child
+            tree._set_new_children(leafs[0], child)
         return tree
 
 
 class VDFace:
-    __id = 0
+    __slots__ = ("top_line_segment", "bottom_line_segment", "left_point", "right_point", "search_leaf", "_neighbors", "_index", "_id")
+    __ids = count()
 
     def __init__(self, top_ls: VDLineSegment, bottom_ls: VDLineSegment, left_point: Point, right_point: Point) -> None:
-        self._top_line_segment: VDLineSegment = top_ls
-        self._bottom_line_segment: VDLineSegment = bottom_ls
-        self._left_point: Point = left_point
-        self._right_point: Point = right_point
-        self._search_leaf: VDLeaf = None
+        self.top_line_segment: VDLineSegment = top_ls
+        self.bottom_line_segment: VDLineSegment = bottom_ls
+        self.left_point: Point = left_point
+        self.right_point: Point = right_point
+        self.search_leaf: VDLeaf = None
         self._neighbors: list[VDFace] = [None, None, None, None]  # Up to four neighbors for each face
-        self._id = VDFace.__id
-        VDFace.__id = VDFace.__id + 1
-
-    # region properties
-
-    @property
-    def search_leaf(self) -> VDLeaf:
-        return self._search_leaf
-
-    @search_leaf.setter
-    def search_leaf(self, search_leaf: VDLeaf):
-        self._search_leaf = search_leaf
-
-    @property
-    def bottom_line_segment(self) -> VDLineSegment:
-        return self._bottom_line_segment
-    
-    @bottom_line_segment.setter
-    def bottom_line_segment(self, bottom_line_segment: VDLineSegment):
-        self._bottom_line_segment = bottom_line_segment
-
-    @property
-    def top_line_segment(self) -> VDLineSegment:
-        return self._top_line_segment
-    
-    @top_line_segment.setter
-    def top_line_segment(self, top_line_segment: VDLineSegment):
-        self._top_line_segment = top_line_segment
-
-    @property
-    def left_point(self) -> Point:
-        return self._left_point
+        self._index: int = -1  # Position in the trapezoid list of the vertical decomposition
+        self._id = next(VDFace.__ids)
 
-    @left_point.setter
-    def left_point(self, point: Point):
-        self._left_point = point
+    # region neighbor properties
 
-    @property
-    def right_point(self) -> Point:
-        return self._right_point
-    
-    @right_point.setter
-    def right_point(self, point: Point):
-        self._right_point = point
-    
     @property
     def neighbors(self) -> list[VDFace]:
         return self._neighbors
@@ -727,12 +841,21 @@ class VDFace:
     # endregion
             
     def __repr__(self) -> str:
-        return f"ID: F{self._id} || Top-LS: {self._top_line_segment} | Bottom-LS: {self._bottom_line_segment} | Left-P: {self._left_point} | Right-P: {self._right_point}"
+        return f"ID: F{self._id} || Top-LS: {self.top_line_segment} | Bottom-LS: {self.bottom_line_segment} | Left-P: {self.left_point} | Right-P: {self.right_point}"
 
 class VDLineSegment(LineSegment):
     def __init__(self, p: Point, q: Point):
         super().__init__(p, q)
-        self._above_dcel_face: Optional[Face] = None  # The original face of the planar subdivision (DCEL)
+        self.above_face: Optional[Face] = None  # The original face of the planar subdivision (DCEL)
+        # Precomputed since the endpoints do not change: endpoints in lexicographic order, terms of y_from_x and the slope
+        upper, lower = self._upper, self._lower
+        if upper.x < lower.x or (upper.x == lower.x and upper.y < lower.y):
+            self._left, self._right = upper, lower
+        else:
+            self._left, self._right = lower, upper
+        self._x_0, self._y_0 = upper.x, upper.y
+        self._dx, self._dy = lower.x - self._x_0, lower.y - self._y_0
+        self._slope = float("inf") if self._left.x - self._right.x == 0 else (self._left.y - self._right.y) / (self._left.x - self._right.x)
 
     @classmethod
     def from_line_segment(cls, line_segment: LineSegment) -> VDLineSegment:
@@ -741,11 +864,31 @@ class VDLineSegment(LineSegment):
     # region properties
 
     @property
-    def above_face(self) -> Face:
-        return self._above_dcel_face
-    
-    @above_face.setter
-    def above_face(self, face: Face):
-        self._above_dcel_face = face
+    def left(self) -> Point:
+        return self._left
+
+    @property
+    def right(self) -> Point:
+        return self._right
 
     # endregion
+
+    def slope(self) -> float:
+        return self._slope
+
+    def y_from_x(self, x):
+        if self._dx == 0:
+            raise Exception(f"Can not give y coordinate for vertical segment {self}")
+        return (x - self._x_0) / self._dx * self._dy + self._y_0
+
+    def vertical_orientations(self, points: Iterable[Point], epsilon: float = EPSILON) -> list[VORT]:
+        """ Same as calling point.vertical_orientation(self) for each of the points, but with the segment terms looked up only once. """
+        if self._dx == 0:  # Vertical line segment
+            x = self._left.x
+            return [_ABOVE if point.x < x else _BELOW if point.x > x else _ON for point in points]
+        x_0, y_0, dx, dy = self._x_0, self._y_0, self._dx, self._dy
+        orientations = []
+        for point in points:
+            difference = (point.x - x_0) / dx * dy + y_0 - point.y
+            orientations.append(_ABOVE if difference < -epsilon else _BELOW if difference > epsilon else _ON)
+        return orientations
@@ -38,6 +38,8 @@ class GeometricObject(ABC):     # TODO: Rename, move and export this.
 
 
 class Point:
+    __slots__ = ("_x", "_y")
+
     def __init__(self, x: SupportsFloat, y: SupportsFloat):
         self._x = float(x)
         self._y = float(y)
@@ -323,6 +325,9 @@ class Rectangle:
     @property
     def lower(self):
         return self._lower
+
+    def contains(self, point: Point) -> bool:
+        return self._left <= point.x <= self._right and self._lower <= point.y <= self._upper
     
 
 class AnimationEvent(ABC):      # TODO: Maybe use an Enum instead...
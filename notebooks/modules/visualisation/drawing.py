@@ -2,6 +2,7 @@ from __future__ import annotations
 from abc import ABC, abstractmethod
 from contextlib import contextmanager
 from itertools import islice
+import asyncio
 import time
 import copy
 from typing import Any, Iterable, Iterator, Optional
@@ -12,19 +13,37 @@ from ..geometry.core import (
 )
 
 from ipycanvas import Canvas, hold_canvas
+import numpy as np
 
 DEFAULT_POINT_RADIUS = 5
 DEFAULT_HIGHLIGHT_RADIUS = 12
 DEFAULT_LINE_WIDTH = 3
 
+_hold_depth = 0
+
+@contextmanager
+def hold_drawing():
+    """ Sends all canvas commands issued inside as a single message. Only the outermost hold flushes, so nested holds don't split the batch. """
+    global _hold_depth
+    if _hold_depth > 0:
+        yield
+        return
+    _hold_depth += 1
+    try:
+        with hold_canvas():
+            yield
+    finally:
+        _hold_depth -= 1
+
 class CanvasDrawingHandle:
     def __init__(self, canvas: Canvas):
         self._canvas = canvas
+        self._height = canvas.height    # The y-axis points upwards, so all y-coordinates are flipped before drawing.
         self.set_colour(0, 0, 0)
 
     @contextmanager
     def hold(self):
-        with hold_canvas(self._canvas):
+        with hold_drawing():
             yield
 
     def set_colour(self, r: int, g: int, b: int):
@@ -42,20 +61,31 @@ class CanvasDrawingHandle:
             return
         if transparent:
             self._canvas.fill_style = self.transparent_style
-        self._canvas.fill_circle(point.x, point.y, radius)
+        self._canvas.fill_circle(point.x, self._height - point.y, radius)
         if transparent:
             self._canvas.fill_style = self.opaque_style
 
     def draw_points(self, points: Iterable[Point], radius: int, transparent: bool = False):
         if radius <= 0:
             return
+        coordinates = np.array([(point.x, point.y) for point in points], dtype = np.float64)
+        if len(coordinates) == 0:
+            return
         if transparent:
             self._canvas.fill_style = self.transparent_style
-        for point in points:
-            self._canvas.fill_circle(point.x, point.y, radius)
+        self._canvas.fill_circles(coordinates[:, 0], self._height - coordinates[:, 1], radius)  # One command for all points
         if transparent:
             self._canvas.fill_style = self.opaque_style
 
+    def draw_paths(self, paths: Iterable[Iterable[Point]], line_width: int):
+        """ Draws open paths that all have the same number of points. """
+        coordinates = np.array([[(point.x, point.y) for point in path] for path in paths], dtype = np.float64)
+        if len(coordinates) == 0 or coordinates.shape[1] < 2:  # Nothing to stroke
+            return
+        coordinates[:, :, 1] = self._height - coordinates[:, :, 1]
+        self._canvas.line_width = abs(line_width)
+        self._canvas.stroke_line_segments(coordinates)  # One command for all paths
+
     def draw_path(self, points: Iterable[Point], line_width: int, close: bool = False, stroke: bool = True,
     fill: bool = False, transparent: bool = False):
         points_iterator = iter(points)
@@ -65,9 +95,9 @@ class CanvasDrawingHandle:
         self._canvas.line_width = abs(line_width)
 
         self._canvas.begin_path()
-        self._canvas.move_to(first_point.x, first_point.y)
+        self._canvas.move_to(first_point.x, self._height - first_point.y)
         for point in points_iterator:
-            self._canvas.line_to(point.x, point.y)
+            self._canvas.line_to(point.x, self._height - point.y)
         
         if close:
             self._canvas.close_path()
@@ -119,7 +149,14 @@ class Drawer:
 
     def animate(self, animation_events: Iterable[AnimationEvent], animation_time_step: float):
         self.clear()
-        self._drawing_mode.animate(self, animation_events, animation_time_step)
+        for _ in self._drawing_mode.animate(self, animation_events):
+            time.sleep(animation_time_step)
+
+    async def animate_async(self, animation_events: Iterable[AnimationEvent], animation_time_step: float):
+        """ Same as animate, but waits between the frames without blocking the event loop. """
+        self.clear()
+        for _ in self._drawing_mode.animate(self, animation_events):
+            await asyncio.sleep(animation_time_step)
 
 
 class DrawingMode(ABC):    # TODO: Maybe we can DRY this file after all...
@@ -128,7 +165,8 @@ class DrawingMode(ABC):    # TODO: Maybe we can DRY this file after all...
         pass
 
     @abstractmethod
-    def animate(self, drawer: Drawer, animation_events: Iterable[AnimationEvent], animation_time_step: float):
+    def animate(self, drawer: Drawer, animation_events: Iterable[AnimationEvent]) -> Iterator[None]:
+        """ Draws the animation frame by frame and yields after each frame, the caller decides how long a frame is shown. """
         pass
 
 
@@ -148,7 +186,7 @@ class PointsMode(DrawingMode):
                 drawer.main_canvas.draw_points(points[:-1], self._point_radius)
                 drawer.main_canvas.draw_point(points[-1], self._highlight_radius, transparent = True)
 
-    def animate(self, drawer: Drawer, animation_events: Iterable[AnimationEvent], animation_time_step: float):
+    def animate(self, drawer: Drawer, animation_events: Iterable[AnimationEvent]) -> Iterator[None]:
         points: list[Point] = []
 
         event_iterator = iter(animation_events)
@@ -169,7 +207,7 @@ class PointsMode(DrawingMode):
             if isinstance(event, PopEvent) and next_event is None:
                 break
             self._draw_animation_step(drawer, points)
-            time.sleep(animation_time_step)
+            yield
 
         drawer.clear()
         self.draw(drawer, points)
@@ -197,7 +235,7 @@ class ArtGalleryMode(PointsMode):
         self._line_width = line_width
         super().__init__(point_radius, highlight_radius)
 
-    def animate(self, drawer: Drawer, animation_events: Iterable[AnimationEvent], animation_time_step: float):
+    def animate(self, drawer: Drawer, animation_events: Iterable[AnimationEvent]) -> Iterator[None]:
         diagonal_points: list[Point] = []
 
         event_iterator = iter(animation_events)
@@ -211,7 +249,7 @@ class ArtGalleryMode(PointsMode):
             for i in range(0, len(diagonal_points), 2):
                 drawer.back_canvas.draw_path(diagonal_points[i:i + 2], self._line_width, transparent = True)
 
-        super().animate(drawer, event_iterator, animation_time_step)
+        yield from super().animate(drawer, event_iterator)
 
 
 class PathMode(DrawingMode):
@@ -243,7 +281,7 @@ class PathMode(DrawingMode):
                 drawer.main_canvas.draw_path(self._animation_path[:-1], self._line_width)
                 drawer.main_canvas.draw_path(self._animation_path[-2:], self._line_width, transparent = True)
 
-    def animate(self, drawer: Drawer, animation_events: Iterable[AnimationEvent], animation_time_step: float):
+    def animate(self, drawer: Drawer, animation_events: Iterable[AnimationEvent]) -> Iterator[None]:
         event_iterator = iter(animation_events)
         next_event = next(event_iterator, None)
 
@@ -262,7 +300,7 @@ class PathMode(DrawingMode):
             if isinstance(event, PopEvent) and next_event is None:
                 break
             self._draw_animation_step(drawer)
-            time.sleep(animation_time_step)
+            yield
 
         drawer.clear()
         self.draw(drawer, self._animation_path)
@@ -300,8 +338,8 @@ class PolygonMode(PathMode):           # TODO: If possible, maybe use compositio
             yield AppendEvent(self._animation_path[0])
             yield PopEvent()
 
-    def animate(self, drawer: Drawer, animation_events: Iterable[AnimationEvent], animation_time_step: float):
-        super().animate(drawer, self._polygon_event_iterator(animation_events), animation_time_step)
+    def animate(self, drawer: Drawer, animation_events: Iterable[AnimationEvent]) -> Iterator[None]:
+        yield from super().animate(drawer, self._polygon_event_iterator(animation_events))
 
 
 class ChansHullMode(PolygonMode):
@@ -315,7 +353,7 @@ class ChansHullMode(PolygonMode):
             line_width = polygon_mode._line_width
         )
 
-    def animate(self, drawer: Drawer, animation_events: Iterable[AnimationEvent], animation_time_step: float):
+    def animate(self, drawer: Drawer, animation_events: Iterable[AnimationEvent]) -> Iterator[None]:
         container: Optional[list[Point]] = None
 
         event_iterator = self._polygon_event_iterator(animation_events)
@@ -336,13 +374,13 @@ class ChansHullMode(PolygonMode):
                         with drawer.front_canvas.hold():
                             drawer.front_canvas.clear()
                             drawer.front_canvas.draw_polygon(container, self._line_width / 3)
-                        time.sleep(animation_time_step)
+                        yield
 
             event.execute_on(self._animation_path)
             if isinstance(event, PopEvent) and next_event is None:
                 break
             self._draw_animation_step(drawer)
-            time.sleep(animation_time_step)
+            yield
 
         drawer.clear()
         self.draw(drawer, self._animation_path)
@@ -365,12 +403,10 @@ class FixedVertexNumberPathsMode(DrawingMode):
         vertex_queue.extend(points)
 
         with drawer.main_canvas.hold():
-            i, j = 0, self._vertex_number
-            while j <= len(vertex_queue):
-                path = vertex_queue[i:j]
-                drawer.main_canvas.draw_points(path, self._vertex_radius)
-                drawer.main_canvas.draw_path(path, self._line_width)
-                i, j = j, j + self._vertex_number
+            i = len(vertex_queue) - len(vertex_queue) % self._vertex_number  # End of the complete paths
+            if i > 0:
+                drawer.main_canvas.draw_points(vertex_queue[:i], self._vertex_radius)
+                drawer.main_canvas.draw_paths((vertex_queue[k:k + self._vertex_number] for k in range(0, i, self._vertex_number)), self._line_width)
 
             if i == 0:
                 offset = int(initial_queue_length != 0)
@@ -397,7 +433,7 @@ class FixedVertexNumberPathsMode(DrawingMode):
             drawer.main_canvas.draw_points(path, self._highlight_radius, transparent = True)
             drawer.main_canvas.draw_path(path, self._line_width, transparent = True)
 
-    def animate(self, drawer: Drawer, animation_events: Iterable[AnimationEvent], animation_time_step: float):
+    def animate(self, drawer: Drawer, animation_events: Iterable[AnimationEvent]) -> Iterator[None]:
         points: list[Point] = []
 
         event_iterator = iter(animation_events)
@@ -422,7 +458,7 @@ class FixedVertexNumberPathsMode(DrawingMode):
             if isinstance(event, PopEvent) and next_event is None:
                 break
             self._draw_animation_step(drawer, points)
-            time.sleep(animation_time_step)
+            yield
 
         drawer.clear()
         self.draw(drawer, points)
@@ -472,7 +508,7 @@ class MonotonePartitioningMode(DrawingMode):    # TODO: If possible, this could
                 right_sweep_line_point = Point(drawer.front_canvas.width, event_point.y)
                 drawer.front_canvas.draw_path((left_sweep_line_point, right_sweep_line_point), self._line_width / 3)
 
-    def animate(self, drawer: Drawer, animation_events: Iterable[AnimationEvent], animation_time_step: float):
+    def animate(self, drawer: Drawer, animation_events: Iterable[AnimationEvent]) -> Iterator[None]:
         points: list[Point] = []
 
         event_iterator = iter(animation_events)
@@ -495,7 +531,7 @@ class MonotonePartitioningMode(DrawingMode):    # TODO: If possible, this could
             if isinstance(event, PopEvent) and next_event is None:
                 break
             self._draw_animation_step(drawer, points)
-            time.sleep(animation_time_step)
+            yield
 
         drawer.clear()
         self.draw(drawer, points)
@@ -509,22 +545,26 @@ class DCELMode(DrawingMode):
 
     def draw(self, drawer: Drawer, points: Iterable[Point]):
         point_queue: list[Point] = drawer._get_drawing_mode_state(default = [])
+        points = list(points)
+        new_points: list[Point] = []
+        connections: list[tuple[Point, Point]] = []
+        for point in points:
+            if point not in point_queue:
+                new_points.append(point)
+            # Connections of the point
+            if not isinstance(point, PointReference):
+                continue
+            for i, neighbor in enumerate(point.container):
+                if i != point.position:
+                    connections.append((point, neighbor))
         with drawer.main_canvas.hold():
-            for point in points:
-                # Draw point
-                if point not in point_queue:
-                    drawer.main_canvas.draw_point(point, self._vertex_radius)
-                # Draw connections of the point
-                if not isinstance(point, PointReference):
-                    continue
-                for i, neighbor in enumerate(point.container):
-                    if i != point.position:
-                        drawer.main_canvas.draw_path([point, neighbor], self._line_width)
+            drawer.main_canvas.draw_points(new_points, self._vertex_radius)
+            drawer.main_canvas.draw_paths(connections, self._line_width)
         
         point_queue.extend(points)  # Keep track of already drawn points
 
-    def animate(self, drawer: Drawer, animation_events: Iterable[AnimationEvent], animation_time_step: float): # TODO
-        pass
+    def animate(self, drawer: Drawer, animation_events: Iterable[AnimationEvent]) -> Iterator[None]: # TODO
+        return iter(())
 
 
 class VerticalExtensionMode(DrawingMode):
@@ -574,7 +614,7 @@ class VerticalExtensionMode(DrawingMode):
             if len(line_segment_list) > 0:
                 drawer.main_canvas.draw_path(drawer._get_drawing_mode_state(default = [])[-1], self._line_width)
 
-    def animate(self, drawer: Drawer, animation_events: Iterable[AnimationEvent], animation_time_step: float):
+    def animate(self, drawer: Drawer, animation_events: Iterable[AnimationEvent]) -> Iterator[None]:
         drawer.main_canvas.set_colour(0, 165, 0)  # green
         drawer.front_canvas.set_colour(0, 0, 255)  # blue
 
@@ -602,7 +642,7 @@ class VerticalExtensionMode(DrawingMode):
                 break
 
             self._draw_animation_step(drawer, points)
-            time.sleep(animation_time_step)
+            yield
 
         drawer.main_canvas.set_colour(0, 0, 255)  # blue
         drawer.front_canvas.set_colour(0, 0, 0)  # black
@@ -655,7 +695,7 @@ class PointLocationMode(PolygonMode):
                                                 Point(self._left_point.x, self._bottom_line_segment.y_from_x(self._left_point.x))],
                                                 self._line_width, stroke = False, fill = True, transparent = True)
 
-    def animate(self, drawer: Drawer, animation_events: Iterable[AnimationEvent], animation_time_step: float):
+    def animate(self, drawer: Drawer, animation_events: Iterable[AnimationEvent]) -> Iterator[None]:
         # Drawing parameters
         canvas_width, canvas_height = drawer.main_canvas._canvas.width, drawer.main_canvas._canvas.height
         self._left_point: Point = Point(0, canvas_height)
@@ -706,7 +746,7 @@ class PointLocationMode(PolygonMode):
                 break
 
             self._draw_animation_step(drawer, points)
-            time.sleep(animation_time_step)
+            yield
 
         # Reset colors
         drawer.back_canvas.set_colour(0, 0, 255)
@@ -1,10 +1,10 @@
 from abc import ABC, abstractmethod
 from itertools import chain
 import time
-from typing import Callable, Generic, Optional, TypeVar, Union
+from typing import Any, Callable, Generic, Optional, TypeVar, Union
 
 from ..geometry.core import GeometricObject, LineSegment, Point, PointReference
-from ..data_structures import DoublyConnectedSimplePolygon, DoublyConnectedEdgeList, PointLocation
+from ..data_structures import DoublyConnectedSimplePolygon, DoublyConnectedEdgeList, PointLocation, Vertex
 from .drawing import DrawingMode, LineSegmentsMode, PointsMode, PolygonMode, DCELMode
 
 import numpy as np
@@ -24,20 +24,18 @@ class InstanceHandle(ABC, Generic[I]):
         return self._drawing_mode
 
     def run_algorithm(self, algorithm: Algorithm[I]) -> tuple[GeometricObject, float]:
-        instance_points = self.extract_points_from_raw_instance(self._instance)
+        backup = self._backup()
 
         start_time = time.perf_counter()
         algorithm_output = algorithm(self._instance)
         end_time = time.perf_counter()
 
-        self.clear()
-        for point in instance_points:
-            self.add_point(point)
+        self._restore(backup)
 
         return algorithm_output, 1000 * (end_time - start_time)
     
     def run_algorithm_with_preprocessing(self, preprocessing: Algorithm[I], algorithm: Algorithm[I]) -> tuple[GeometricObject, float]:
-        instance_points = self.extract_points_from_raw_instance(self._instance)
+        backup = self._backup()
 
         preprocessing(self._instance)
 
@@ -45,12 +43,19 @@ class InstanceHandle(ABC, Generic[I]):
         algorithm_output = algorithm(self._instance)
         end_time = time.perf_counter()
 
-        self.clear()
-        for point in instance_points:
-            self.add_point(point)
+        self._restore(backup)
 
         return algorithm_output, 1000 * (end_time - start_time)
 
+    def _backup(self) -> Any:
+        """ Saves what is needed to restore the instance after an algorithm ran on it. """
+        return self._extract_instance_points()
+
+    def _restore(self, backup: Any):
+        self.clear()
+        for point in backup:
+            self.add_point(point)
+
     @abstractmethod
     def add_point(self, point: Point) -> Union[bool, tuple[bool, Point]]:
         pass
@@ -68,6 +73,9 @@ class InstanceHandle(ABC, Generic[I]):
     def extract_points_from_raw_instance(instance: I) -> list[Point] | list[PointReference]:
         pass
 
+    def _extract_instance_points(self) -> list[Point] | list[PointReference]:
+        return self.extract_points_from_raw_instance(self._instance)
+
     @property
     @abstractmethod
     def default_number_of_random_points(self) -> int:
@@ -76,7 +84,7 @@ class InstanceHandle(ABC, Generic[I]):
     def generate_random_points(self, max_x: float, max_y: float, number: int) -> list[Point]:
         x_values = np.random.uniform(0.05 * max_x, 0.95 * max_x, number)
         y_values = np.random.uniform(0.05 * max_y, 0.95 * max_y, number)
-        return [Point(x, y) for x, y  in zip(x_values, y_values)]
+        return [Point(x, y) for x, y  in zip(x_values.tolist(), y_values.tolist())]
 
 
 class PointSetInstance(InstanceHandle[set[Point]]):
@@ -95,6 +103,13 @@ class PointSetInstance(InstanceHandle[set[Point]]):
     def clear(self):
         self._instance.clear()
 
+    def _backup(self) -> set[Point]:
+        return self._instance.copy()
+
+    def _restore(self, backup: set[Point]):
+        self._instance.clear()
+        self._instance.update(backup)
+
     def size(self) -> int:
         return len(self._instance)
 
@@ -109,7 +124,7 @@ class PointSetInstance(InstanceHandle[set[Point]]):
     def generate_random_points(self, max_x: float, max_y: float, number: int) -> list[Point]:
         x_values = np.clip(np.random.normal(0.5 * max_x, 0.15 * max_x, number), 0.05 * max_x, 0.95 * max_x)
         y_values = np.clip(np.random.normal(0.5 * max_y, 0.15 * max_y, number), 0.05 * max_y, 0.95 * max_y)
-        return [Point(x, y) for x, y in zip(x_values, y_values)]
+        return [Point(x, y) for x, y in zip(x_values.tolist(), y_values.tolist())]
 
 
 class LineSegmentSetInstance(InstanceHandle[set[LineSegment]]):
@@ -138,6 +153,13 @@ class LineSegmentSetInstance(InstanceHandle[set[LineSegment]]):
         self._instance.clear()
         self._cached_point = None
 
+    def _backup(self) -> set[LineSegment]:
+        return self._instance.copy()
+
+    def _restore(self, backup: set[LineSegment]):
+        self.clear()
+        self._instance.update(backup)
+
     def size(self) -> int:
         return len(self._instance)
 
@@ -150,13 +172,15 @@ class LineSegmentSetInstance(InstanceHandle[set[LineSegment]]):
         return 500
 
     def generate_random_points(self, max_x: float, max_y: float, number: int) -> list[Point]:
-        points: list[Point] = []
-        for point in super().generate_random_points(max_x, max_y, number // 2):
-            points.append(point)
-            scale = np.random.uniform(0.01, 0.05)
-            x = np.clip(np.random.normal(point.x, scale * max_x), 0.05 * max_x, 0.95 * max_x)
-            y = np.clip(np.random.normal(point.y, scale * max_y), 0.05 * max_y, 0.95 * max_y)
-            points.append(Point(x, y))
+        # Draw all segments at once: rows 0, 2, 4, ... are the first and rows 1, 3, 5, ... the second endpoints.
+        half = number // 2
+        coordinates = np.empty((2 * half, 2))
+        coordinates[0::2, 0] = np.random.uniform(0.05 * max_x, 0.95 * max_x, half)
+        coordinates[0::2, 1] = np.random.uniform(0.05 * max_y, 0.95 * max_y, half)
+        scales = np.random.uniform(0.01, 0.05, half)
+        coordinates[1::2, 0] = np.clip(np.random.normal(coordinates[0::2, 0], scales * max_x), 0.05 * max_x, 0.95 * max_x)
+        coordinates[1::2, 1] = np.clip(np.random.normal(coordinates[0::2, 1], scales * max_y), 0.05 * max_y, 0.95 * max_y)
+        points = [Point(x, y) for x, y in coordinates.tolist()]
 
         if number % 2 == 1:
             points.extend(super().generate_random_points(max_x, max_y, 1))
@@ -210,17 +234,21 @@ class DCELInstance(InstanceHandle[DoublyConnectedEdgeList]):
             drawing_mode = DCELMode(vertex_radius = 3)
         self._drawing_epsilon = drawing_epsilon
         self._last_added_point = None
+        self._extract_cache: Optional[tuple[DoublyConnectedEdgeList, int, list[PointReference]]] = None
+        self._grid: dict[tuple[int, int], list[tuple[int, Point]]] = {}
+        self._grid_vertices: Optional[list[Vertex]] = None
+        self._grid_cell: float = drawing_epsilon
+        self._grid_size: int = 0
         self._dcel = self._instance  # This is so that that DCELInstance can be used by the PointLocationInstance where the dcel is not the instance itself
         super().__init__(DoublyConnectedEdgeList(), drawing_mode)
 
     def add_point(self, point: Point) -> bool:
         # Check if point is already in the DCEL
         is_new_point = True
-        for instance_point in self._dcel.points:
-            if instance_point.close_to(point, epsilon = self._drawing_epsilon):
-                is_new_point = False
-                point = instance_point
-                break
+        instance_point = self._find_close_point(point)
+        if instance_point is not None:
+            is_new_point = False
+            point = instance_point
 
         # Add point (if necessary)
         if is_new_point:
@@ -230,15 +258,9 @@ class DCELInstance(InstanceHandle[DoublyConnectedEdgeList]):
                 for i, neighbor in enumerate(point.container):
                     if i == point.position:
                         continue
-                    if neighbor not in [vertex.point for vertex in self._dcel.vertices]:
+                    if self._dcel.find_vertex(neighbor) is None:
                         continue
-                    found = False
-                    for edge in self._dcel.edges:
-                        if edge.origin == point and edge.destination == neighbor:
-                            found = True
-                            break
-                    if not found:
-                        self._dcel.add_edge_by_points(point, neighbor)
+                    self._dcel.add_edge_by_points(point, neighbor)  # Does nothing if the edge already exists
             else:
                 self._dcel.add_vertex(point)
 
@@ -252,6 +274,35 @@ class DCELInstance(InstanceHandle[DoublyConnectedEdgeList]):
 
         return is_new_point, point
 
+    def _find_close_point(self, point: Point) -> Optional[Point]:
+        """ Returns the first point of the DCEL (in vertex order) that is close to the given point. """
+        if self._drawing_epsilon <= 0:  # No distance is smaller, so nothing is snapped (and the grid would have no cell size)
+            return None
+        self._update_grid()
+        cell = self._drawing_epsilon
+        cell_x, cell_y = int(point.x // cell), int(point.y // cell)
+        close_point, close_index = None, None
+        for i in range(cell_x - 1, cell_x + 2):
+            for j in range(cell_y - 1, cell_y + 2):
+                for index, instance_point in self._grid.get((i, j), ()):
+                    if (close_index is None or index < close_index) and instance_point.close_to(point, epsilon = self._drawing_epsilon):
+                        close_point, close_index = instance_point, index
+        return close_point
+
+    def _update_grid(self):
+        """ Adds the DCEL points that are not yet in the grid (cell size = drawing epsilon, so close points are in neighbouring cells). """
+        vertices = self._dcel.vertices
+        if self._grid_vertices is not vertices or self._grid_cell != self._drawing_epsilon or self._grid_size > len(vertices):
+            self._grid = {}
+            self._grid_vertices = vertices
+            self._grid_cell = self._drawing_epsilon
+            self._grid_size = 0
+        cell = self._grid_cell
+        for index in range(self._grid_size, len(vertices)):
+            instance_point = vertices[index].point
+            self._grid.setdefault((int(instance_point.x // cell), int(instance_point.y // cell)), []).append((index, instance_point))
+        self._grid_size = len(vertices)
+
     def clear(self):
         self._instance.clear()
         self._last_added_point = None
@@ -273,54 +324,75 @@ class DCELInstance(InstanceHandle[DoublyConnectedEdgeList]):
             point_list.append(PointReference(neighbors, 0))
         return point_list
 
+    def _backup(self) -> tuple[DoublyConnectedEdgeList, int, list[PointReference]]:
+        return self._dcel, self._dcel.revision, self._extract_instance_points()
+
+    def _restore(self, backup: tuple[DoublyConnectedEdgeList, int, list[PointReference]]):
+        dcel, revision, instance_points = backup
+        if dcel is self._dcel and dcel.revision == revision:  # The algorithm did not change the DCEL, so it does not need to be rebuilt
+            self._last_added_point = None
+        else:
+            super()._restore(instance_points)
+
+    def _extract_instance_points(self) -> list[PointReference]:
+        """ Extracts the points of the DCEL, reusing the last result as long as the DCEL has not changed. """
+        cache = self._extract_cache
+        if cache is None or cache[0] is not self._dcel or cache[1] != self._dcel.revision:
+            cache = self._dcel, self._dcel.revision, DCELInstance.extract_points_from_raw_instance(self._dcel)
+            self._extract_cache = cache
+        return cache[2]
+
     @property
     def default_number_of_random_points(self) -> int:
         return 20
     
     def generate_random_points(self, max_x: float, max_y: float, number: int, min_distance = None) -> list[PointReference]:
+        if min_distance is None:
+            min_distance = self._drawing_epsilon
         while True:
             # grid pattern with min distance up/down and left/right = 1
-            if min_distance is None:
-                min_distance = self._drawing_epsilon
-            points = super().generate_random_points(max_x/min_distance, max_y/min_distance, number)
-
-            points = [Point(np.round(point.x, 0), np.round(point.y, 0)) for point in points]
-            points = [Point(point.x*min_distance, point.y*min_distance) for point in points]
-
-            if len(points) != len(set(points)):  # Duplicate point(s)
-                continue
-
-            # 2-OPT path as in DCSP
-            path = list(points)
-            n = len(path)
+            points: list[Point] = []
+            while len(points) < number:  # Only redraw the points that collided with another point
+                new_points = super().generate_random_points(max_x/min_distance, max_y/min_distance, number - len(points))
+                new_points = [Point(round(point.x)*min_distance, round(point.y)*min_distance) for point in new_points]
+                points = list(dict.fromkeys(points + new_points))  # Removes duplicates, but keeps the order
+
+            # 2-OPT path as in DCSP (on indices of the points, with all pairwise distances computed once)
+            n = len(points)
+            distances = [[p.distance(q) for q in points] for p in points]
+            order = list(range(n))
             found_improvement = True
             while found_improvement:
                 found_improvement = False
                 for i in range(0, n - 1):
+                    distances_i = distances[order[i]]  # order[i] is not changed by the reversals below
                     for j in range(i + 1, n):
-                        subpath_distances = path[i].distance(path[j]) + path[i + 1].distance(path[(j + 1) % n])
-                        neighbour_distances = path[i].distance(path[i + 1]) + path[j].distance(path[(j + 1) % n])
+                        distances_j = distances[order[j]]
+                        next_i, next_j = order[i + 1], order[(j + 1) % n]
+                        subpath_distances = distances_i[order[j]] + distances[next_i][next_j]
+                        neighbour_distances = distances_i[next_i] + distances_j[next_j]
                         if subpath_distances < neighbour_distances:
-                            path[i + 1:j + 1] = reversed(path[i + 1:j + 1])
+                            order[i + 1:j + 1] = reversed(order[i + 1:j + 1])
                             found_improvement = True
-                        #print("loop end")
+            path = [points[k] for k in order]
             
             circle = [(i, i + 1) for i in range(n - 1)]
             if len(circle) > 1:
                 circle.append((n - 1, 0))
             try:
                 dcel = DoublyConnectedEdgeList(path, circle)
-            except Exception():
+            except Exception:
                 continue
 
-            # Add some more edges:
+            # Add some more edges (random pairs of different vertices, each pair is tried only once):
             count = 0
             first  = np.int32(np.random.uniform(0, dcel.number_of_vertices, 1000))
             second = np.int32(np.random.uniform(0, dcel.number_of_vertices, 1000))
-            tuple = zip(first, second)
-            for tuple in zip(first, second):
+            different = first != second
+            pairs = dict.fromkeys(zip(first[different].tolist(), second[different].tolist()))  # Removes duplicates, but keeps the random order
+            for pair in pairs:
                 try:
-                    if dcel.add_edge(tuple, True):
+                    if dcel.add_edge(pair, True):
                         count = count + 1
                         if count >= number / 5:
                             break
@@ -336,9 +408,18 @@ class PointLocationInstance(DCELInstance, InstanceHandle[PointLocation]):
         self._drawing_mode = drawing_mode
         self._drawing_epsilon = drawing_epsilon
         self._last_added_point = None
+        self._extract_cache: Optional[tuple[DoublyConnectedEdgeList, int, list[PointReference]]] = None
+        self._grid: dict[tuple[int, int], list[tuple[int, Point]]] = {}
+        self._grid_vertices: Optional[list[Vertex]] = None
+        self._grid_cell: float = drawing_epsilon
+        self._grid_size: int = 0
         self._instance = PointLocation(random_seed=random_seed)
         self._dcel = self._instance._dcel
 
+    def _restore(self, backup: tuple[DoublyConnectedEdgeList, int, list[PointReference]]):
+        super()._restore(backup)
+        self._instance._search_structure = None  # As after clearing the point location
+
     @staticmethod
     def extract_points_from_raw_instance(instance: Union[DoublyConnectedEdgeList, PointLocation]) -> list[PointReference]:
         if isinstance(instance, DoublyConnectedEdgeList):
@@ -1,9 +1,11 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
 import html
 import time
 from typing import Callable, Generic, Iterable, Optional
 
-from ..geometry.core import Point
-from .drawing import CanvasDrawingHandle, Drawer, DrawingMode
+from ..geometry.core import AnimationEvent, Point
+from .drawing import CanvasDrawingHandle, Drawer, DrawingMode, hold_drawing
 from .instances import Algorithm, I, InstanceHandle
 
 from ipycanvas import MultiCanvas
@@ -41,8 +43,10 @@ class VisualisationTool(Generic[I]):
         self._next_image_number: int = 1
 
         self._previous_callback_finish_time: float = time.time()
+        self._is_busy = False
+        self._executor = ThreadPoolExecutor(max_workers = 1)
         def handle_click_on_multi_canvas(x: float, y: float):
-            if time.time() - self._previous_callback_finish_time < 1.0:       # TODO: This doesn't work well...
+            if self._is_busy or time.time() - self._previous_callback_finish_time < 1.0:       # TODO: This doesn't work well...
                 return
             if self.add_point(Point(x, self._height - y)):
                 self.clear_algorithm_drawings()
@@ -64,8 +68,6 @@ class VisualisationTool(Generic[I]):
 
     def _init_canvases(self):
         for i in range(0, 6):
-            self._multi_canvas[i].translate(0, self._height)
-            self._multi_canvas[i].scale(1, -1)
             self._multi_canvas[i].line_cap = "round"
             self._multi_canvas[i].line_join = "round"
 
@@ -85,6 +87,10 @@ class VisualisationTool(Generic[I]):
         self._current_algorithm_drawer: Optional[Drawer] = None
 
     def _init_ui(self):
+        # Every layout and style is a widget of its own, so these are shared by all buttons and fixed-width items.
+        self._default_item_layout = Layout(width = self._DEFAULT_ITEM_WIDTH)
+        self._button_style = ButtonStyle(button_color = "rgb(229, 228, 226)", font_weight = "600")
+
         self._instance_size_info = HTML()
         self._update_instance_size_info()
 
@@ -105,16 +111,17 @@ class VisualisationTool(Generic[I]):
         )
         self._random_number_hbox = HBox(
             [HTML("Points:"), self._random_number_int_text],
-            layout = Layout(width = self._DEFAULT_ITEM_WIDTH)
+            layout = self._default_item_layout
         )
 
         self._random_message = HTML("<br>")
         def random_button_callback():
-            self.clear()
             self._random_message.value = "<b>GENERATING</b>"
-            self.add_points(self._instance.generate_random_points(
-                self._width, self._height, self._random_number_int_text.value
-            ))
+            with hold_drawing(), self._instance_size_info.hold_sync():  # Only the final size is sent
+                self.clear()
+                self.add_points(self._instance.generate_random_points(
+                    self._width, self._height, self._random_number_int_text.value
+                ))
             self._random_message.value = "<br>"
 
         self._random_button = self._create_button("Random", random_button_callback)
@@ -124,7 +131,7 @@ class VisualisationTool(Generic[I]):
             value = False,
             description = "Animations",
             indent = False,
-            layout = Layout(width = self._DEFAULT_ITEM_WIDTH)
+            layout = self._default_item_layout
         )
 
         self._animation_speed_int_text = BoundedIntText(
@@ -207,16 +214,22 @@ class VisualisationTool(Generic[I]):
         for point in points:
             if self._number_of_points >= self._MAX_NUMBER_OF_POINTS or not self._is_point_in_range(point):
                 break
-            if self._instance.add_point(point):
+            was_point_added = self._instance.add_point(point)
+            if not isinstance(was_point_added, bool):  # Same as in add_point, the (possibly changed) point is returned as well
+                was_point_added, point = was_point_added
+            if was_point_added:
                 added_points.append(point)
                 self._number_of_points += 1
 
-        self._instance_drawer.draw(added_points)
+        if added_points:    # Some drawing modes redraw everything, even for no new points
+            with hold_drawing():
+                self._instance_drawer.draw(added_points)
         self._update_instance_size_info()
 
     def clear(self):
-        self.clear_instance()
-        self.clear_algorithm_drawings()
+        with hold_drawing():
+            self.clear_instance()
+            self.clear_algorithm_drawings()
         self.clear_algorithm_messages()
 
     def clear_instance(self):
@@ -242,8 +255,9 @@ class VisualisationTool(Generic[I]):
                 raise ValueError(f"Can't register instance because the contained point {point} is out of range.")
 
         def example_instance_callback():
-            self.clear()
-            self.add_points(example_instance_points)
+            with hold_drawing(), self._instance_size_info.hold_sync():  # Only the final size is sent
+                self.clear()
+                self.add_points(example_instance_points)
 
         self._example_buttons.append(self._create_button(name, example_instance_callback))
 
@@ -252,29 +266,45 @@ class VisualisationTool(Generic[I]):
         index = len(self._algorithm_messages)
         self._algorithm_messages.append(HTML("<br>"))
 
-        def algorithm_callback():
-            self.clear_algorithm_drawings()
-            self._algorithm_messages[index].value = "<b>RUNNING</b>"
+        def show_error(message: str):
+            title = html.escape(message, quote = True)
+            self._algorithm_messages[index].value = f"<b title='{title}'><font color='red'>ERROR</font></b>"
 
-            try:
-                if preprocessing is None:
-                    algorithm_output, algorithm_running_time = self._instance.run_algorithm(algorithm)
-                else:
-                    algorithm_output, algorithm_running_time = self._instance.run_algorithm_with_preprocessing(preprocessing, algorithm)
-            except Exception as exception:
-                title = html.escape(str(exception), quote = True)
-                self._algorithm_messages[index].value = f"<b title='{title}'><font color='red'>ERROR</font></b>"
-                return
+        def run_algorithm():
+            if preprocessing is None:
+                return self._instance.run_algorithm(algorithm)
+            else:
+                return self._instance.run_algorithm_with_preprocessing(preprocessing, algorithm)
+
+        def show_algorithm_output(algorithm_output, algorithm_running_time: float) -> Optional[asyncio.Task]:
+            def show_result():
+                self._algorithm_messages[index].value = f"{algorithm_running_time:.3f} ms"
+                self._current_algorithm_drawer = algorithm_drawer
 
             if not self._animation_checkbox.value:
-                algorithm_drawer.draw(algorithm_output.points())
+                points = list(algorithm_output.points())
+                if points:  # The algorithm drawings were already cleared
+                    with hold_drawing():
+                        algorithm_drawer.draw(points)
             else:
                 self._algorithm_messages[index].value = "<b><font color='blue'>ANIMATING</font></b>"
                 animation_time_step = 0.8 ** self._animation_speed_int_text.value
-                algorithm_drawer.animate(algorithm_output.animation_events(), animation_time_step)
+                animation = self._animate(algorithm_drawer, algorithm_output.animation_events(), animation_time_step)
+                if animation is not None:
+                    def animation_done_callback(animation: asyncio.Task):
+                        if animation.cancelled() or animation.exception() is not None:
+                            show_error("Animation cancelled" if animation.cancelled() else str(animation.exception()))
+                        else:
+                            show_result()
+                    animation.add_done_callback(animation_done_callback)
+                    return animation
+
+            show_result()
 
-            self._algorithm_messages[index].value = f"{algorithm_running_time:.3f} ms"
-            self._current_algorithm_drawer = algorithm_drawer
+        def algorithm_callback():
+            self.clear_algorithm_drawings()
+            self._algorithm_messages[index].value = "<b>RUNNING</b>"
+            return self._run_algorithm(run_algorithm, show_algorithm_output, show_error)
 
         self._algorithm_buttons.append(self._create_button(name, algorithm_callback))
 
@@ -291,16 +321,21 @@ class VisualisationTool(Generic[I]):
 
     def _create_button(self, description: str, callback: Callable, layout: Optional[Layout] = None) -> Button:
         if layout is None:
-            layout = Layout(width = self._DEFAULT_ITEM_WIDTH)
-        style = ButtonStyle(button_color = "rgb(229, 228, 226)", font_weight = "600")
+            layout = self._default_item_layout
 
-        def button_callback(_: Button):
-            self.disable_widgets()
-            callback()
+        def finish_callback():
             self.enable_widgets()
             self._previous_callback_finish_time = time.time()
 
-        button = Button(description = description, layout = layout, style = style)
+        def button_callback(_: Button):
+            self.disable_widgets()
+            animation = callback()
+            if animation is None:
+                finish_callback()
+            else:  # The widgets stay disabled until the animation is done
+                animation.add_done_callback(lambda _: finish_callback())
+
+        button = Button(description = description, layout = layout, style = self._button_style)
         button.on_click(button_callback)
 
         return button
@@ -319,12 +354,63 @@ class VisualisationTool(Generic[I]):
 
         return VBox([HTML(f"<h2>{header}</h2>"), vbox])
 
+    def _animate(self, drawer: Drawer, animation_events: Iterable[AnimationEvent], animation_time_step: float) -> Optional[asyncio.Task]:
+        """ Runs the animation as a task if an event loop is running (as in a notebook), so the kernel stays responsive.
+        Otherwise the animation blocks until it is done and None is returned.
+        """
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            drawer.animate(animation_events, animation_time_step)
+            return None
+
+        async def animation():
+            try:
+                await drawer.animate_async(animation_events, animation_time_step)
+            finally:
+                self._is_busy = False
+
+        self._is_busy = True
+        return loop.create_task(animation())
+
+    def _run_algorithm(self, run: Callable, show_output: Callable, show_error: Callable[[str], None]) -> Optional[asyncio.Task]:
+        """ Runs the algorithm in a worker thread if an event loop is running (as in a notebook), so the kernel stays responsive.
+        The output is shown on the event loop afterwards and the returned task also waits for a possible animation.
+        Otherwise everything happens before returning and None is returned.
+        """
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            try:
+                algorithm_output, algorithm_running_time = run()
+            except Exception as exception:
+                show_error(str(exception))
+                return None
+            return show_output(algorithm_output, algorithm_running_time)
+
+        async def algorithm():
+            try:
+                try:
+                    algorithm_output, algorithm_running_time = await loop.run_in_executor(self._executor, run)
+                except Exception as exception:
+                    show_error(str(exception))
+                    return
+                animation = show_output(algorithm_output, algorithm_running_time)
+                if animation is not None:
+                    await asyncio.wait([animation])
+            finally:
+                self._is_busy = False
+
+        self._is_busy = True
+        return loop.create_task(algorithm())
+
     def _is_point_in_range(self, point: Point) -> bool:
         return 0 <= point.x <= self._width and 0 <= point.y <= self._height
 
     def _update_instance_size_info(self):
-        info_value = f"Instance size: {self._instance.size():0>3}"
-        if self._number_of_points != self._instance.size():
+        instance_size = self._instance.size()
+        info_value = f"Instance size: {instance_size:0>3}"
+        if self._number_of_points != instance_size:
             info_value += f" (Number of points: {self._number_of_points:0>3})"
         self._instance_size_info.value = info_value
 